@@ -1,15 +1,25 @@
 import os
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from utils_parser import (
-    extract, add_course, remove_course, simulate_retake,
-    cgpa_projection, cgpa_planner, cod_planner, course_node,
-    get_unlocked_courses, get_all_course_codes, load_course_resources, get_session_cod_sets
+from streamlit.errors import StreamlitAPIException
+import numpy as np
+from itertools import product
+from gradesheet_core.planner import (
+    add_course, remove_course, simulate_retake,
+    cgpa_projection, cgpa_planner, cod_planner, course_totals, current_cgpa,
+    simulate_retake_batch, cgpa_planner_sweep
 )
-from shared_data import (
-    preq, arts_st, cst_st, core, science_st, ss_st, labs, comp_cod, tarc, cs_elective
+from gradesheet_core.parser import course_node
+from gradesheet_core.parser import parse_cancelled
+from gradesheet_core.guard import parse_limit_error
+from gradesheet_core.parse_jobs import submit_parse
+from gradesheet_core.forecast import forecast_cgpa, default_grade_counts
+from gradesheet_core.prereq_graph import graph, frontier_tracker
+from gradesheet_core.scheduler import schedule_graduation
+from gradesheet_core.cod_solver import cod_plans
+from gradesheet_core.resource_index import RESOURCE_DIR, get_index, watch_resources
+from views import fingerprint, cod_sets, course_options, completed_breakdown, semester_trends
+from gradesheet_core.catalog import (
+    preq, arts_st, cst_st, core, science_st, ss_st, labs, comp_cod, tarc, cs_elective, grade_points
 )
 
 st.set_page_config(
@@ -66,6 +76,9 @@ if "name" not in st.session_state:
     st.session_state.semesters_done = {}
     st.session_state.dept = "CSE"
     
+if "frontier" not in st.session_state:
+    st.session_state.frontier = frontier_tracker(st.session_state.courses_done)
+
 if "prev_dept" not in st.session_state:
     st.session_state.prev_dept = st.session_state.get("dept", "CSE")
 
@@ -87,39 +100,74 @@ if st.session_state.dept != st.session_state.get("prev_dept"):
     st.rerun()
 
 
+def load_gradesheet(name, sid, c_done, s_done):
+    st.session_state.name = name
+    st.session_state.id = sid
+    st.session_state.uploaded = True
+    st.session_state.courses_done = c_done
+    st.session_state.semesters_done = s_done
+    st.session_state.frontier = frontier_tracker(c_done)
+    st.session_state.original_gpas = {c: n.gpa for c, n in c_done.items()}
+    st.session_state.info_refreshed = False
+
+# Parsing runs on the shared background pool; this fragment polls the
+# session's job so the page stays usable until the result is in.
+@st.fragment(run_every=0.5)
+def parse_status():
+    job = st.session_state.parse_job
+    if job.done():
+        st.session_state.parse_job = None
+        try:
+            load_gradesheet(*job.result())
+        except parse_cancelled:
+            st.session_state.parse_error = "Parsing cancelled. Upload the file again to retry."
+        except parse_limit_error as e:
+            st.session_state.parse_error = str(e)
+        except Exception:
+            st.session_state.parse_error = "Could not read this gradesheet. Make sure it is the PDF downloaded from Connect."
+        st.rerun()
+
+    if job.state == "queued":
+        st.progress(0.0, text="Waiting for a free parser...")
+    else:
+        st.progress(job.fraction, text=f"Parsing page {job.pages_done} of {job.page_count or '?'}...")
+    if st.button("Cancel", key="cancel_parse"):
+        job.cancel()
+
 if not st.session_state.uploaded:
     pdf = st.sidebar.file_uploader("Upload your Gradesheet", type="pdf")
 
-    if pdf:
-        with open("temp.pdf", "wb") as f:
-            f.write(pdf.read())
-        name, sid, c_done, s_done = extract("temp.pdf")
-        st.session_state.name = name
-        st.session_state.id = sid
-        st.session_state.uploaded = True
-        st.session_state.courses_done = c_done
-        st.session_state.semesters_done = s_done
-        st.session_state.original_gpas = {c: n.gpa for c, n in c_done.items()}
-        st.session_state.info_refreshed = False
-        st.rerun()
+    if pdf and pdf.file_id != st.session_state.get("parse_for"):
+        if st.session_state.get("parse_job") is not None:
+            st.session_state.parse_job.cancel()
+        st.session_state.parse_for = pdf.file_id
+        st.session_state.parse_error = None
+        st.session_state.parse_job = submit_parse(pdf.getvalue())
+
+    if st.session_state.get("parse_job") is not None:
+        with st.sidebar:
+            parse_status()
+    elif st.session_state.get("parse_error"):
+        st.sidebar.error(st.session_state.parse_error)
 
 else:
     st.sidebar.write("✅ Gradesheet uploaded! Refresh the page to upload another.\n\nYou can close this sidebar by pressing the arrow on the **top right**.")
 
 
 
-# Tabs
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+# Sections: only the selected one is rendered, and each is a fragment so
+# its own widgets rerun it without re-running the rest of the page.
+TAB_NAMES = [
     "Courses & Retake", "CGPA Planner", "COD Planner", "Visual Analytics", "Unlocked Courses", "Course Resources", "Completed Course Breakdown"
-])
+]
+active_tab = st.radio("Section", TAB_NAMES, horizontal=True, key="active_tab", label_visibility="collapsed")
 
 
 # Helper: calculate CGPA
 def calculate_cgpa():
     courses_done = st.session_state.courses_done
-    total_credits = sum(c.credit for c in courses_done.values())
-    total_points = sum(c.gpa * c.credit for c in courses_done.values())
-    return (round(total_points / total_credits, 2) if total_credits else 0.0, total_credits)
+    total_credits, _ = course_totals(courses_done)
+    return (current_cgpa(courses_done), total_credits)
 
 # Helper: refresh info
 def refresh_info():
@@ -130,9 +178,22 @@ def refresh_info():
 if "cgpa" not in st.session_state:
     refresh_info()
 
+def rerun_tab():
+    # Fragment-scoped reruns are only allowed while the fragment itself is
+    # rerunning; if it is being drawn as part of a full run, rerun the page.
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def current_fingerprint():
+    return fingerprint(st.session_state.courses_done, st.session_state.dept, st.session_state.semesters_done)
+
 # ========== TAB 1 ==========
-with tab1:
+@st.fragment
+def courses_tab():
     st.header("Student & Academic Info")
+    fp = current_fingerprint()
     st.markdown(
     """
     <div style="
@@ -172,11 +233,6 @@ with tab1:
         st.success("Student info refreshed!")
 
     if st.session_state.uploaded:
-        if not st.session_state.get("info_refreshed", False):
-            refresh_info()
-            st.session_state.info_refreshed = True
-            st.success("Student info refreshed!")
-
         name = '[Hidden]' if blur else st.session_state.name
         student_id = '[Hidden]' if blur else st.session_state.id
 
@@ -191,12 +247,12 @@ with tab1:
         # Add course
         with col_left:
             st.subheader("➕ Add a Course")
-            all_course_codes = get_all_course_codes()
-            eligible_to_add = [
-                code for code in all_course_codes
-                if code not in st.session_state.courses_done
-                and code not in st.session_state.added_courses
-            ]
+            eligible_to_add, retake_options = course_options(
+                fp,
+                tuple(sorted(st.session_state.added_courses)),
+                tuple(sorted(st.session_state.retakes)),
+                st.session_state.courses_done
+            )
 
             new_code = st.selectbox("Select New Course to Add", options=eligible_to_add, key="new_course_select")
             new_gpa = st.number_input("GPA", min_value=0.0, max_value=4.0, step=0.01, key="new_course_gpa")
@@ -204,21 +260,18 @@ with tab1:
 
             if st.button("Add Course", disabled=not can_add):
                 add_course(new_code, new_gpa, st.session_state.courses_done, st.session_state.semesters_done)
+                st.session_state.frontier.touch(new_code, st.session_state.courses_done)
                 st.session_state.original_gpas[new_code] = new_gpa
                 st.session_state.added_courses.add(new_code)
                 refresh_info()
                 st.session_state.info_refreshed = True
-                st.rerun()
+                rerun_tab()
 
 
 
         # Retake course
         with col_right:
             st.subheader("🔁 Retake a Course")
-            retake_options = [
-                code for code, node in st.session_state.courses_done.items()
-                if node.gpa < 4.0 and code not in st.session_state.retakes
-            ]
             course_to_retake = st.selectbox("Select Course to Retake", retake_options, key="retake_select")
             retake_gpa = st.number_input("New GPA", min_value=0.0, max_value=4.0, step=0.01, key="retake_gpa")
 
@@ -229,7 +282,7 @@ with tab1:
                 add_course(course_to_retake, retake_gpa, st.session_state.courses_done, st.session_state.semesters_done)
                 refresh_info()
                 st.session_state.info_refreshed = True
-                st.rerun()
+                rerun_tab()
 
 
 
@@ -253,14 +306,44 @@ with tab1:
                     st.session_state.added_courses.remove(course)
                     st.session_state.original_gpas.pop(course, None)
                     remove_course(course, st.session_state.courses_done, st.session_state.semesters_done)
+                st.session_state.frontier.touch(course, st.session_state.courses_done)
             refresh_info()
             st.session_state.info_refreshed = True
-            st.rerun()
+            rerun_tab()
+
+        st.markdown("---")
+        st.subheader("🧪 Compare Retake Scenarios")
+        st.caption("Pick courses and the grades you might get. Every combination is evaluated at once; click a column header to sort.")
+        scenario_courses = st.multiselect("Courses to compare", options=retake_options, max_selections=5, key="scenario_courses")
+        scenario_grades = st.multiselect(
+            "Possible grades", options=[g for g in grade_points if g != "A+"], default=["A", "B+", "B"], key="scenario_grades"
+        )
+
+        if scenario_courses and scenario_grades:
+            labels = np.array(["Keep"] + scenario_grades)
+            choices = np.array([np.nan] + [grade_points[g] for g in scenario_grades])
+            scenario_count = len(choices) ** len(scenario_courses)
+
+            if scenario_count > 20000:
+                st.warning(f"{scenario_count} scenarios is too many to list. Pick fewer courses or grades.")
+            else:
+                picks = np.array(list(product(range(len(choices)), repeat=len(scenario_courses))))
+                new_cgpas = simulate_retake_batch(st.session_state.courses_done, scenario_courses, choices[picks])
+
+                import pandas as pd
+                df_scenarios = pd.DataFrame(labels[picks], columns=scenario_courses)
+                df_scenarios["Retakes"] = (picks > 0).sum(axis=1)
+                df_scenarios["New CGPA"] = new_cgpas
+                df_scenarios["Change"] = np.round(new_cgpas - st.session_state.cgpa, 2)
+                df_scenarios = df_scenarios.sort_values(["New CGPA", "Retakes"], ascending=[False, True], ignore_index=True)
+                df_scenarios.index = range(1, len(df_scenarios) + 1)
+                st.dataframe(df_scenarios, use_container_width=True, height=350)
     else:
         st.info("Upload a Gradesheet to begin.")
 
 # ========== TAB 2 ==========
-with tab2:
+@st.fragment
+def planner_tab():
     st.header("📊 CGPA Planner & Projection")
 
     st.subheader("🎯 Set Your Target CGPA")
@@ -288,11 +371,7 @@ with tab2:
                 st.warning("Please enter both future semesters and courses per semester to plan ahead.")
 
                 # Show current CGPA
-                done_courses = st.session_state.courses_done
-                total_credits = sum(c.credit for c in done_courses.values())
-                total_points = sum(c.gpa * c.credit for c in done_courses.values())
-                current_cgpa = round(total_points / total_credits, 2) if total_credits else 0.0
-                st.metric("Current CGPA", current_cgpa)
+                st.metric("Current CGPA", st.session_state.cgpa)
             else:
                 required_credits = 136 if st.session_state.dept == "CSE" else 124
                 result = cgpa_planner(
@@ -320,13 +399,89 @@ with tab2:
             if "message" in proj:
                 st.info(proj["message"])
 
+    st.markdown("---")
+    st.subheader("🗺️ Planner Sweep")
+    st.write("Required average GPA for every target and plan length at once.")
+
+    sweep_col1, sweep_col2, sweep_col3 = st.columns(3)
+    target_range = sweep_col1.slider("Target CGPA Range", min_value=0.0, max_value=4.0, value=(3.0, 4.0), step=0.05, key="sweep_targets")
+    max_semesters = sweep_col2.slider("Up to Future Semesters", min_value=1, max_value=12, value=8, key="sweep_semesters")
+    sweep_courses = sweep_col3.slider("Courses per Semester", min_value=1, max_value=6, value=4, key="sweep_courses")
+
+    required_credits = 136 if st.session_state.dept == "CSE" else 124
+    sweep_targets = np.round(np.arange(target_range[0], target_range[1] + 0.001, 0.05), 2)
+    sweep_semesters = np.arange(1, max_semesters + 1)
+    sweep = cgpa_planner_sweep(
+        st.session_state.courses_done,
+        sweep_targets,
+        sweep_semesters,
+        [sweep_courses],
+        total_required_credits=required_credits
+    )
+    required_grid = np.where(sweep["achievable"], sweep["required_avg_gpa"], np.nan)[:, :, 0]
+
+    import plotly.express as px
+    fig_sweep = px.imshow(
+        required_grid,
+        x=[str(s) for s in sweep_semesters],
+        y=[f"{t:.2f}" for t in sweep_targets],
+        labels=dict(x="Future Semesters", y="Target CGPA", color="Required Avg GPA"),
+        color_continuous_scale="RdYlGn_r",
+        zmin=0.0,
+        zmax=4.0,
+        text_auto=".2f",
+        aspect="auto",
+    )
+    fig_sweep.update_yaxes(autorange=True)
+    fig_sweep.update_layout(template="plotly_dark", height=max(300, 28 * len(sweep_targets)))
+    st.plotly_chart(fig_sweep, use_container_width=True)
+    st.caption("Blank cells are out of reach with that plan, even with 4.00 in every course.")
+
+    st.markdown("---")
+    st.subheader("🎲 Graduation CGPA Forecast")
+    st.write("Simulate your remaining courses many times to see where your final CGPA is likely to land.")
+
+    forecast_trials = st.select_slider("Simulations", options=[10_000, 50_000, 100_000, 250_000, 500_000], value=100_000)
+    if st.button("Run Forecast"):
+        required_credits = 136 if st.session_state.dept == "CSE" else 124
+        forecast = forecast_cgpa(
+            st.session_state.courses_done,
+            target_cgpa,
+            trials=forecast_trials,
+            dept=st.session_state.dept,
+            total_required_credits=required_credits,
+            grade_counts=default_grade_counts(),
+            seed=0
+        )
+        pct = forecast["percentiles"]
+        f_col1, f_col2, f_col3, f_col4 = st.columns(4)
+        f_col1.metric("Pessimistic (10th pct)", pct[10])
+        f_col2.metric("Median CGPA", pct[50])
+        f_col3.metric("Optimistic (90th pct)", pct[90])
+        f_col4.metric(f"Chance of {forecast['target']:.2f}+", f"{forecast['p_target']:.1%}")
+
+        edges = np.array(forecast["histogram"]["edges"])
+        fig_forecast = px.bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=np.array(forecast["histogram"]["counts"]) / forecast["trials"],
+            labels={"x": "Final CGPA", "y": "Share of Simulations"},
+        )
+        fig_forecast.add_vline(x=forecast["target"], line_dash="dash", line_color="#EF553B")
+        fig_forecast.update_layout(template="plotly_dark", height=350, bargap=0.05)
+        st.plotly_chart(fig_forecast, use_container_width=True)
+        st.caption(
+            f"{forecast['trials']:,} simulations over {forecast['credits']:.0f} remaining credits "
+            f"({len(forecast['courses'])} courses and elective slots)."
+        )
+
 
 # ========== TAB 3 ==========
-with tab3:
+@st.fragment
+def cod_tab():
     st.header("📚 COD Planner")
+    fp = current_fingerprint()
 
-    from utils_parser import get_session_cod_sets
-    comp_cod_session, arts_st_session = get_session_cod_sets(st.session_state.courses_done)
+    comp_cod_session, arts_st_session = cod_sets(fp, st.session_state.courses_done)
 
     if st.button("🎯 Generate COD Plan"):
         cod = cod_planner(st.session_state.courses_done)
@@ -374,9 +529,29 @@ with tab3:
             with st.expander(f"{stream_label} ({len(remaining)} remaining)"):
                 st.write("• " + "\n• ".join(remaining) if remaining else "✅ All courses in this stream completed.")
 
+        if cod["total_taken"] < 5:
+            st.markdown("### 🧩 Ranked COD Plans")
+            ranked = cod_plans(st.session_state.courses_done, arts_st_session)
+            if ranked["plans"]:
+                st.write(f"{ranked['count']:,} valid ways to finish your CODs. Top picks cover the most streams:")
+                import pandas as pd
+                df_plans = pd.DataFrame([
+                    {"Courses": ", ".join(p["courses"]), "Streams Covered": p["score"]}
+                    for p in ranked["plans"]
+                ])
+                df_plans.index = range(1, len(df_plans) + 1)
+                st.dataframe(df_plans, use_container_width=True)
+            else:
+                st.warning(cod["message"])
+
 # ========== TAB 4 ==========
-with tab4:
+@st.fragment
+def analytics_tab():
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.header("📊 Visual Analytics Dashboard")
+    fp = current_fingerprint()
 
     completed = st.session_state.total_credits
     required_credits = 136 if st.session_state.dept == "CSE" else 124
@@ -405,59 +580,9 @@ with tab4:
         *Zoom in as much as you like — a quick double-click will always bring you back to sanity.*
         """)
 
-    def semester_sort_key(sem_str):
-        if sem_str == "VIRTUAL SEMESTER":
-            return (9999, 3)
-        semester_order = {"SPRING": 0, "SUMMER": 1, "FALL": 2}
-        try:
-            sem, year = sem_str.split()
-            return (int(year), semester_order.get(sem.upper(), 99))
-        except:
-            return (9999, 99)
-
-    sem_data = st.session_state.semesters_done
-    filtered_semesters = {sem: node for sem, node in sem_data.items() if sem.upper() != "NULL"}
-    sorted_semesters = sorted(filtered_semesters.keys(), key=semester_sort_key)
-
-    semesters, gpas, cgpas, top_courses = [], [], [], []
-
-    for sem in sorted_semesters:
-        node = filtered_semesters[sem]
-        if not node.courses:
-            continue
-        avg_gpa = node.gpa
-        deviations = [(abs(c.gpa - avg_gpa), c.course) for c in node.courses]
-        max_deviation_course = max(deviations, default=(0, "N/A"))[1]
-        semesters.append(sem)
-        gpas.append(node.gpa)
-        cgpas.append(node.cgpa)
-        top_courses.append(max_deviation_course)
-
-    if semesters:
-        semesters_list, gpas, cgpas, most_off_track = [], [], [], []
-
-        for sem in sorted_semesters:
-            node = filtered_semesters[sem]
-            if not node.courses:
-                continue
-
-            avg_gpa = node.gpa
-            lowest_course = min(node.courses, key=lambda c: c.gpa)
-            lowest_course_str = f"{lowest_course.course} ({lowest_course.gpa:.2f})"
-
-            semesters_list.append(sem)
-            gpas.append(node.gpa)
-            cgpas.append(node.cgpa)
-            most_off_track.append(lowest_course_str)
-
-        df = pd.DataFrame({
-            "Semester": semesters_list,
-            "GPA": gpas,
-            "CGPA": cgpas,
-            "Most Off-Track Course": most_off_track
-        })
-
+    df = semester_trends(fp, st.session_state.semesters_done)
 
+    if df is not None:
         fig_gpa = px.line(
             df,
             x="Semester",
@@ -496,11 +621,13 @@ with tab4:
 
 
 # ========== TAB 5 ==========
-with tab5:
+@st.fragment
+def unlocked_tab():
     st.header("🚀 Unlocked Courses Explorer")
+    fp = current_fingerprint()
 
-    unlocked, unlocks_by = get_unlocked_courses(st.session_state.courses_done)
-    comp_cod_session, _ = get_session_cod_sets(st.session_state.courses_done)
+    unlocked = st.session_state.frontier
+    comp_cod_session, _ = cod_sets(fp, st.session_state.courses_done)
 
     col1, col2 = st.columns(2)
 
@@ -511,8 +638,12 @@ with tab5:
         st.subheader("✅ Unlocked Core Courses")
         core_unlocked = sorted([c for c in unlocked if c in core_set])
         for course in core_unlocked:
-            unlocked_list = unlocks_by.get(course, [])
-            st.write(f"• {course}  ⇒  unlocks: {', '.join(unlocked_list) if unlocked_list else 'None'}")
+            unlocked_list = graph.unlock_map.get(course, ())
+            downstream = len(graph.transitive_unlocks(course))
+            st.write(
+                f"• {course}  ⇒  unlocks: {', '.join(unlocked_list) if unlocked_list else 'None'}"
+                + (f"  _(opens {downstream} courses down the line)_" if downstream > len(unlocked_list) else "")
+            )
 
     with col2:
         st.subheader("📘 Unlocked Compulsory COD Courses")
@@ -529,40 +660,76 @@ with tab5:
         else:
             st.write("No compulsory COD courses are left.")
 
+    st.markdown("---")
+    st.subheader("🗓️ Fastest Path to Graduation")
+    plan_col1, plan_col2 = st.columns(2)
+    plan_courses = plan_col1.slider("Max Courses per Semester", min_value=1, max_value=6, value=4, key="path_max_courses")
+    plan_credits = plan_col2.number_input("Max Credits per Semester (0 = no limit)", min_value=0, max_value=24, value=0, key="path_max_credits")
+    if plan_credits and plan_credits < 4:
+        st.warning("A semester needs room for at least 4 credits (CSE400).")
+    else:
+        schedule = schedule_graduation(
+            st.session_state.courses_done,
+            dept=st.session_state.dept,
+            max_courses=plan_courses,
+            max_credits=float(plan_credits) if plan_credits else None
+        )
+        st.info(schedule["message"])
+        if schedule["semesters"]:
+            import pandas as pd
+            df_schedule = pd.DataFrame([
+                {"Courses": ", ".join(sem["courses"]), "Credits": sem["credits"]}
+                for sem in schedule["semesters"]
+            ])
+            df_schedule.index = [f"Semester {i}" for i in range(1, len(df_schedule) + 1)]
+            st.dataframe(df_schedule, use_container_width=True)
+            req = schedule["requirements"]
+            st.caption(
+                f"Plans {req['planned_credits']:g} of {req['total_required']} credits, "
+                f"including CODs ({', '.join(req['cod']) or 'none left'}) and electives "
+                f"({', '.join(req['electives']) or 'none needed'})."
+                + ("" if schedule["optimal"] else " Search budget ran out; this plan may not be the shortest.")
+            )
+
+    st.markdown("---")
+    st.subheader("🧭 Course Path Explorer")
+    path_course = st.selectbox("Pick a course", sorted(graph.index), key="path_course")
+    path_col1, path_col2 = st.columns(2)
+    with path_col1:
+        downstream = graph.transitive_unlocks(path_course)
+        st.write(f"**{path_course} eventually unlocks:** {', '.join(downstream) if downstream else 'Nothing'}")
+    with path_col2:
+        blockers = graph.blocking(path_course, st.session_state.courses_done)
+        if path_course in st.session_state.courses_done:
+            st.write(f"✅ {path_course} is already completed.")
+        elif blockers:
+            st.write(f"**Still blocking {path_course}:** {', '.join(blockers)}")
+        else:
+            st.write(f"✅ Nothing is blocking {path_course}.")
+
     st.markdown("---")
     st.markdown("In order to check which COD course you should take, please check the COD Planner")
 
 
-RESOURCE_DIR = "resources"
-from utils_parser import get_all_course_codes, load_course_resources
-import os
+@st.cache_resource
+def start_resource_watcher():
+    return watch_resources(RESOURCE_DIR)
 
-RESOURCE_DIR = "resources"
-
-def get_courses_with_resources():
-    valid_courses = []
-    for code in get_all_course_codes():
-        data = load_course_resources(code, resource_dir=RESOURCE_DIR)
-        if not data:
-            continue
-        has_resources = bool(data.get("resources"))
-        has_mid = bool(data.get("previous_questions", {}).get("mid"))
-        has_final = bool(data.get("previous_questions", {}).get("final"))
-        if has_resources or has_mid or has_final:
-            valid_courses.append(code)
-    return sorted(valid_courses)
-
-with tab6:
+@st.fragment
+def resources_tab():
     st.header("📚 Course Resources & Previous Questions")
 
-    course_options = get_courses_with_resources()
+    start_resource_watcher()
+
+    resources = get_index()
+    course_options = resources.courses_with_resources
     if not course_options:
         st.info("No resource-rich courses available.")
     else:
         selected = st.selectbox("🔍 Search Course", options=course_options)
 
         if selected:
-            data = load_course_resources(selected, resource_dir=RESOURCE_DIR)
+            data = resources.get(selected)
             st.subheader(data.get("title", selected))
 
             if data.get("resources"):
@@ -582,74 +749,70 @@ with tab6:
                     st.markdown(f"🧠 [Final Questions]({final})")
 
 #=============TAB 7==============
-with tab7:
+@st.fragment
+def breakdown_tab():
     st.header("Completed Courses Breakdown")
+    fp = current_fingerprint()
 
-    courses_done = st.session_state.courses_done
-    comp_cod_session, arts_st_session = get_session_cod_sets(courses_done)
-
-    core_data = []
-    comp_cod_data = []
-    elective_data = []
-    cod_data = []
-
-    dept = st.session_state.get("dept", "CSE")
-    core_set = core if dept == "CSE" else core - cs_elective
-
-    for code in sorted(courses_done.keys()):
-        if code in core_set:
-            core_data.append({"Course Code": code})
-        elif code in comp_cod_session:
-            comp_cod_data.append({"Course Code": code})
-        elif code.startswith("CSE") and code not in core_set and code not in comp_cod_session:
-            elective_data.append({"Course Code": code})
-        elif code in cst_st:
-            cod_data.append({"Course Code": code, "Stream": "CST"})
-        elif code in arts_st_session:
-            cod_data.append({"Course Code": code, "Stream": "Arts"})
-        elif code in ss_st:
-            cod_data.append({"Course Code": code, "Stream": "Social Sciences"})
-        elif code in science_st:
-            cod_data.append({"Course Code": code, "Stream": "Science"})
+    breakdown = completed_breakdown(fp, st.session_state.get("dept", "CSE"), st.session_state.courses_done)
 
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.subheader(f"Core Courses ({len(core_data)})")
-        if core_data:
-            df_core = pd.DataFrame(core_data)
-            df_core.index = range(1, len(df_core) + 1)
+        df_core = breakdown["core"]
+        st.subheader(f"Core Courses ({len(df_core)})")
+        if len(df_core):
             st.dataframe(df_core, use_container_width=True, height=300)
         else:
             st.info("No core courses completed.")
 
     with col2:
-        st.subheader(f"Compulsory COD ({len(comp_cod_data)})")
-        if comp_cod_data:
-            df_comp = pd.DataFrame(comp_cod_data)
-            df_comp.index = range(1, len(df_comp) + 1)
+        df_comp = breakdown["comp_cod"]
+        st.subheader(f"Compulsory COD ({len(df_comp)})")
+        if len(df_comp):
             st.dataframe(df_comp, use_container_width=True, height=300)
         else:
             st.info("No compulsory core courses completed.")
 
     with col3:
-        st.subheader(f"COD Courses ({len(cod_data)})")
-        if cod_data:
-            df_cod = pd.DataFrame(cod_data).sort_values(by=["Stream", "Course Code"])
-            df_cod.index = range(1, len(df_cod) + 1)
+        df_cod = breakdown["cod"]
+        st.subheader(f"COD Courses ({len(df_cod)})")
+        if len(df_cod):
             st.dataframe(df_cod, use_container_width=True, height=300)
         else:
             st.info("No COD courses completed.")
 
     with col4:
-        st.subheader(f"Electives ({len(elective_data)})")
-        if elective_data:
-            df_elec = pd.DataFrame(elective_data)
-            df_elec.index = range(1, len(df_elec) + 1)
+        df_elec = breakdown["elective"]
+        st.subheader(f"Electives ({len(df_elec)})")
+        if len(df_elec):
             st.dataframe(df_elec, use_container_width=True, height=300)
         else:
             st.info("No elective courses completed.")
 
+    st.markdown("---")
+    up_next = sorted(st.session_state.frontier)
+    st.subheader(f"🔓 Unlocked Next ({len(up_next)})")
+    st.write(", ".join(up_next) if up_next else "No prerequisite-gated courses are waiting on you.")
+
+tab_renderers = {
+    "Courses & Retake": courses_tab,
+    "CGPA Planner": planner_tab,
+    "COD Planner": cod_tab,
+    "Visual Analytics": analytics_tab,
+    "Unlocked Courses": unlocked_tab,
+    "Course Resources": resources_tab,
+    "Completed Course Breakdown": breakdown_tab,
+}
+# A background parse can finish while any section is open, so the totals
+# are brought up to date here rather than by one section's renderer.
+if st.session_state.uploaded and not st.session_state.get("info_refreshed", False):
+    refresh_info()
+    st.session_state.info_refreshed = True
+    st.success("Student info refreshed!")
+
+tab_renderers[active_tab]()
+
 import datetime
 import random
 
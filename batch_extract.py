@@ -0,0 +1,160 @@
+import os
+import sys
+import glob
+import json
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from gradesheet_core.parser import gradesheet_record
+from gradesheet_core.guard import parse_guard, default_guard
+
+log = logging.getLogger("batch_extract")
+
+def find_pdfs(source):
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.pdf")
+        paths = glob.glob(pattern, recursive=True)
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(os.path.abspath(p) for p in paths if os.path.isfile(p))
+
+def batch_guard(workers=None):
+    # Each file is parsed in a sandbox worker, so a PDF that crashes MuPDF or
+    # gets OOM-killed fails on its own instead of breaking a shared process
+    # pool and every file queued on it. Same limits as uploads, but a parse
+    # waits for a worker instead of being turned away.
+    return parse_guard(workers or os.cpu_count(), default_guard.max_pages, default_guard.timeout,
+                       default_guard.memory_mb, default_guard.max_bytes / 2**20, wait=None)
+
+def parse_one(path, layout=False, guard=default_guard):
+    name, id, courses_done, semesters_done = guard.extract(path, layout=layout)
+    record = gradesheet_record(name, id, courses_done, semesters_done)
+    record["path"] = path
+    return record
+
+def load_checkpoint(checkpoint_path, retry_failed=False):
+    done = set()
+    if not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write leaves a truncated last line behind.
+                continue
+            if entry.get("status") == "ok" or not retry_failed:
+                done.add(entry["path"])
+    return done
+
+class jsonl_writer:
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class parquet_writer:
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        course = pa.struct([
+            ("course", pa.string()), ("grade", pa.string()), ("gpa", pa.float64()),
+            ("credit", pa.float64()), ("semester", pa.string()),
+        ])
+        semester = pa.struct([
+            ("semester", pa.string()), ("courses", pa.list_(pa.string())), ("credit", pa.float64()),
+            ("gpa", pa.float64()), ("cgpa", pa.float64()),
+        ])
+        self.pa = pa
+        self.schema = pa.schema([
+            ("path", pa.string()), ("name", pa.string()), ("id", pa.string()),
+            ("courses", pa.list_(course)), ("semesters", pa.list_(semester)),
+        ])
+
+        # Parquet files cannot be appended to, so a resumed run writes the
+        # next numbered part next to the original output.
+        stem, ext = os.path.splitext(path)
+        part = 0
+        while os.path.exists(path):
+            part += 1
+            path = f"{stem}.part{part}{ext}"
+        self.path = path
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, record):
+        table = self.pa.Table.from_pylist([record], schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+def open_writer(output, fmt=None):
+    if fmt is None:
+        fmt = "parquet" if output.endswith(".parquet") else "jsonl"
+    if fmt == "parquet":
+        return parquet_writer(output)
+    return jsonl_writer(output)
+
+def run_batch(source, output, checkpoint=None, workers=None, fmt=None, retry_failed=False, layout=False):
+    checkpoint = checkpoint or output + ".checkpoint"
+    done = load_checkpoint(checkpoint, retry_failed)
+    pending = [p for p in find_pdfs(source) if p not in done]
+    log.info("%d files to parse, %d already in checkpoint", len(pending), len(done))
+
+    stats = {"ok": 0, "failed": 0, "skipped": len(done)}
+    if not pending:
+        return stats
+
+    guard = batch_guard(workers)
+    writer = open_writer(output, fmt)
+    try:
+        # The threads only feed the sandbox workers and wait on their pipes.
+        with open(checkpoint, "a", encoding="utf-8") as ckpt, \
+                ThreadPoolExecutor(max_workers=guard.max_parses) as pool:
+            futures = {pool.submit(parse_one, path, layout, guard): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    log.error("failed to parse %s: %s", path, e)
+                    stats["failed"] += 1
+                    entry = {"path": path, "status": "error", "error": str(e)}
+                else:
+                    writer.write(record)
+                    stats["ok"] += 1
+                    entry = {"path": path, "status": "ok"}
+                ckpt.write(json.dumps(entry) + "\n")
+                ckpt.flush()
+    finally:
+        writer.close()
+        guard.close()
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a batch of BRACU gradesheet PDFs.")
+    parser.add_argument("source", help="directory of PDFs or a glob pattern")
+    parser.add_argument("-o", "--output", required=True, help="output .jsonl or .parquet file")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="override format from extension")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--retry-failed", action="store_true", help="re-parse files that failed last run")
+    parser.add_argument("--layout", action="store_true", help="use region-clipped, layout-aware extraction")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stats = run_batch(args.source, args.output, args.checkpoint, args.workers, args.format, args.retry_failed, args.layout)
+    log.info("done: %d parsed, %d failed, %d skipped", stats["ok"], stats["failed"], stats["skipped"])
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
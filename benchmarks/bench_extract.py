@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from gradesheet_core.parser import extract, gradesheet_record
+
+HEADER = ["BRAC University", "Kha 224, Bir Uttam Rafiqul Islam Avenue ", "Merul Badda, Dhaka 1212.",
+          "GRADE SHEET", "UNOFFICIAL COPY", "UNDERGRADUATE PROGRAM "]
+GRADES = [("A+", 4.0), ("A", 4.0), ("A-", 3.7), ("B+", 3.3), ("B", 3.0), ("B-", 2.7), ("C+", 2.3), ("C", 2.0)]
+COURSES = ["CSE110", "MAT110", "PHY111", "ENG101", "CSE111", "MAT120", "PHY112", "ENG102", "CSE220",
+           "CSE230", "CSE221", "CSE250", "STA201", "CSE251", "CSE260", "CSE320", "CSE321", "HUM103",
+           "CSE330", "CSE331", "CSE340", "PSY101", "CSE341", "CSE350", "CSE360", "CSE370", "HUM101"]
+
+SEMESTER_ROWS = 7
+
+def synthetic_gradesheet(pages, seed=0):
+    # A well-formed transcript of exactly `pages` pages: every semester block
+    # (header, four courses, summary, CGPA) is kept whole on one page.
+    rnd = random.Random(seed)
+    doc = fitz.open()
+    state = {"page": None, "y": 0}
+
+    def new_page():
+        page = doc.new_page(width=595, height=842)
+        y = 30
+        for line in HEADER:
+            page.insert_text((200, y), line, fontsize=9)
+            y += 14
+        page.insert_text((250, 820), f"Page {doc.page_count} of {pages}", fontsize=8)
+        state["page"], state["y"] = page, y + 10
+
+    def row(*cells):
+        for x, text in cells:
+            state["page"].insert_text((x, state["y"]), text, fontsize=9)
+        state["y"] += 14
+
+    new_page()
+    row((40, "Name"), (140, ":"), (180, "SYNTHETIC STUDENT"))
+    row((40, "Student ID"), (140, ":"), (180, "20100000"))
+    semester = 0
+    while True:
+        if state["y"] + 14 * (SEMESTER_ROWS - 1) > 780:
+            if doc.page_count == pages:
+                break
+            new_page()
+        row((40, "SEMESTER:"), (120, f"{['SPRING', 'SUMMER', 'FALL'][semester % 3]} {2000 + semester // 3}"))
+        for i in range(4):
+            grade, gpa = rnd.choice(GRADES)
+            row((40, COURSES[(semester * 4 + i) % len(COURSES)]), (120, "Course Title"),
+                (360, "3.00"), (420, grade), (480, f"{gpa:.2f}"))
+        row((40, "SEMESTER"), (120, "Credits Attempted"), (220, "Credits Earned"),
+            (320, "12.00"), (380, "12.00"), (440, f"{rnd.uniform(2, 4):.2f}"))
+        row((40, "CGPA"), (120, f"{rnd.uniform(2, 4):.2f}"))
+        semester += 1
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs page-parallel extract() timings.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 4, 8, 16, 32, 64])
+    parser.add_argument("-j", "--workers", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} cpus={os.cpu_count()}")
+    print(f"{'pages':>6} {'sequential ms':>14} {'parallel ms':>12} {'speedup':>8} {'identical':>10}")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Warm the pool so process start-up is not billed to the first row.
+        list(pool.map(abs, range(args.workers)))
+        for pages in args.pages:
+            data = synthetic_gradesheet(pages)
+            seq_time, seq = best_of(args.repeat, lambda: extract(data))
+            par_time, par = best_of(args.repeat, lambda: extract(data, workers=args.workers, executor=pool))
+            identical = gradesheet_record(*seq) == gradesheet_record(*par)
+            print(f"{pages:>6} {seq_time * 1000:>14.1f} {par_time * 1000:>12.1f} "
+                  f"{seq_time / par_time:>7.2f}x {str(identical):>10}")
+
+if __name__ == "__main__":
+    main()
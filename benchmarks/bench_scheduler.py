@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gradesheet_core.prereq_graph import graph
+from gradesheet_core.parser import course_node
+from gradesheet_core.scheduler import schedule_graduation
+
+def reachable_states():
+    # Every prerequisite-closed subset of the courses that take part in the
+    # graph, i.e. every transcript a student could actually be holding.
+    linked = [i for i in range(len(graph.codes)) if graph.prereq_mask[i] or graph.dependents[i]]
+    stack = [(0, 0)]
+    while stack:
+        k, mask = stack.pop()
+        if k == len(linked):
+            yield mask
+            continue
+        i = linked[k]
+        stack.append((k + 1, mask))
+        if not graph.prereq_mask[i] & ~mask:
+            stack.append((k + 1, mask | (1 << i)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Graduation scheduler timings over reachable partial transcripts.")
+    parser.add_argument("--dept", choices=["CSE", "CS"], default="CSE")
+    parser.add_argument("--max-courses", type=int, default=4)
+    parser.add_argument("--max-credits", type=float)
+    parser.add_argument("--stride", type=int, default=1, help="solve every Nth state")
+    args = parser.parse_args()
+
+    timings = []
+    gaps = Counter()
+    proven = 0
+    start = time.perf_counter()
+    for n, mask in enumerate(reachable_states()):
+        if n % args.stride:
+            continue
+        courses_done = {code: course_node(code, gpa=3.0) for code in graph.codes_of(mask)}
+        t = time.perf_counter()
+        result = schedule_graduation(courses_done, args.dept, args.max_courses, args.max_credits)
+        timings.append(time.perf_counter() - t)
+        gaps[result["count"] - result["lower_bound"]] += 1
+        proven += result["optimal"]
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    pick = lambda q: timings[min(int(q * len(timings)), len(timings) - 1)] * 1000
+    print(f"states={len(timings)} dept={args.dept} max_courses={args.max_courses} max_credits={args.max_credits}")
+    print(f"total {elapsed:.1f}s  mean {sum(timings) / len(timings) * 1000:.2f}ms  "
+          f"p50 {pick(0.5):.2f}ms  p95 {pick(0.95):.2f}ms  p99 {pick(0.99):.2f}ms  max {timings[-1] * 1000:.2f}ms")
+    print(f"proven optimal {proven}/{len(timings)}  gap above lower bound: "
+          + ", ".join(f"{gap}: {count}" for gap, count in sorted(gaps.items())))
+
+if __name__ == "__main__":
+    main()
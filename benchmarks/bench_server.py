@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+from tornado.netutil import bind_sockets
+from tornado.httpserver import HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import make_app, parse_pdf, PERCENTILES
+from gradesheet_core.guard import parse_guard
+
+ENDPOINTS = ("parse", "projection", "planner", "cod", "retake", "unlocked")
+
+def request_body(endpoint, pdf_bytes, record):
+    if endpoint == "parse":
+        return pdf_bytes
+    body = {"courses": record["courses"]}
+    if endpoint == "projection":
+        body["target_cgpa"] = 3.5
+    elif endpoint == "planner":
+        body.update(target_cgpa=3.5, semesters=4, courses_per_sem=4)
+    elif endpoint == "retake":
+        worst = min(record["courses"], key=lambda c: c["gpa"])
+        body["regrades"] = {worst["course"]: "A"}
+    return json.dumps(body).encode()
+
+async def load(base_url, endpoint, body, total, concurrency):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    timings, failures = [], {}
+    pending = iter(range(total))
+
+    async def worker():
+        for _ in pending:
+            t = time.perf_counter()
+            try:
+                await client.fetch(f"{base_url}/{endpoint}", method="POST", body=body, request_timeout=120)
+            except HTTPClientError as e:
+                failures[e.code] = failures.get(e.code, 0) + 1
+            timings.append(time.perf_counter() - t)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    metrics = json.loads((await client.fetch(f"{base_url}/metrics")).body)
+    return timings, failures, elapsed, metrics
+
+async def run(args, pdf_bytes, record):
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        # No server given: start one in this process on a free port.
+        sockets = bind_sockets(0, "127.0.0.1")
+        guard = parse_guard(max_parses=args.max_parses, wait=args.parse_wait)
+        guard.warm()
+        HTTPServer(make_app(guard, args.max_concurrency, args.queue_timeout)).add_sockets(sockets)
+        base_url = f"http://127.0.0.1:{sockets[0].getsockname()[1]}"
+    body = request_body(args.endpoint, pdf_bytes, record)
+    return await load(base_url, args.endpoint, body, args.requests, args.concurrency)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test one endpoint of the JSON API.")
+    parser.add_argument("pdf", help="gradesheet PDF used for /parse and to build the planner payloads")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="parse")
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="client connections in flight")
+    parser.add_argument("--url", help="running server to target (default: start one in-process)")
+    parser.add_argument("-j", "--max-parses", type=int, help="in-process server: PDFs parsed at once")
+    parser.add_argument("--parse-wait", type=float, default=1.0, help="in-process server: parse slot wait")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="in-process server: request slots")
+    parser.add_argument("--queue-timeout", type=float, default=5.0, help="in-process server: slot wait")
+    args = parser.parse_args()
+
+    with open(args.pdf, "rb") as f:
+        pdf_bytes = f.read()
+    record = parse_pdf(pdf_bytes)
+    timings, failures, elapsed, metrics = asyncio.run(run(args, pdf_bytes, record))
+
+    ms = np.percentile(timings, PERCENTILES) * 1000
+    print(f"{args.endpoint}: {len(timings)} requests, concurrency {args.concurrency}, "
+          f"{len(timings) / elapsed:.1f} req/s, failures {failures or 0}")
+    print("client  " + "  ".join(f"p{p} {v:.1f}ms" for p, v in zip(PERCENTILES, ms)) + f"  max {max(timings) * 1000:.1f}ms")
+    route = metrics["routes"].get(args.endpoint, {})
+    print("server  " + "  ".join(f"p{p} {route.get(f'p{p}_ms', 0):.1f}ms" for p in PERCENTILES)
+          + f"  max {route.get('max_ms', 0):.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Names are resolved on first access so that importing one piece (say, the
+# parser in a batch worker) does not load the planners, the scheduler or
+# the resource index along with it.
+_exports = {
+    "catalog": (
+        "grades", "grade_points", "preq", "core", "cs_elective", "comp_cod",
+        "get_all_course_codes", "get_session_cod_sets",
+    ),
+    "gradebook": ("grade_book", "semester_map", "VIRTUAL_SEMESTER"),
+    "parser": (
+        "course_node", "semester_node", "courses_map", "semesters_map", "pdf_source", "parse_result",
+        "transcript_parser", "parse_lines", "read_pdf_bytes", "extract", "gradesheet_record", "courses_from_record",
+        "progress_hook", "parse_cancelled",
+    ),
+    "planner": (
+        "course_totals", "current_cgpa", "add_course", "remove_course",
+        "cgpa_projection", "cgpa_planner", "cgpa_projection_sweep", "cgpa_planner_sweep", "round_cents",
+        "cod_planner", "simulate_retake", "simulate_retake_batch", "get_unlocked_courses",
+    ),
+    "prereq_graph": ("prereq_graph", "graph", "frontier_tracker"),
+    "cod_solver": ("cod_plans",),
+    "scheduler": ("graduation_requirements", "schedule_graduation"),
+    "forecast": ("forecast_cgpa", "load_grade_counts", "default_grade_counts"),
+    "resource_index": ("resource_index", "get_index", "load_course_resources", "watch_resources"),
+    "parse_cache": ("parse_cache", "cached_extract", "cache_stats"),
+    "parse_jobs": ("parse_job", "submit_parse"),
+    "guard": ("parse_guard", "parse_limit_error", "default_guard", "guarded_extract"),
+}
+_module_of = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = sorted(_module_of)
+
+def __getattr__(name):
+    module = _module_of.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+if TYPE_CHECKING:
+    from .catalog import (grades, grade_points, preq, core, cs_elective, comp_cod,
+                          get_all_course_codes, get_session_cod_sets)
+    from .gradebook import grade_book, semester_map, VIRTUAL_SEMESTER
+    from .parser import (course_node, semester_node, courses_map, semesters_map, pdf_source, parse_result,
+                         transcript_parser, parse_lines, read_pdf_bytes, extract, gradesheet_record,
+                         courses_from_record, progress_hook, parse_cancelled)
+    from .planner import (course_totals, current_cgpa, add_course, remove_course,
+                          cgpa_projection, cgpa_planner, cgpa_projection_sweep, cgpa_planner_sweep, round_cents,
+                          cod_planner, simulate_retake, simulate_retake_batch, get_unlocked_courses)
+    from .prereq_graph import prereq_graph, graph, frontier_tracker
+    from .cod_solver import cod_plans
+    from .scheduler import graduation_requirements, schedule_graduation
+    from .forecast import forecast_cgpa, load_grade_counts, default_grade_counts
+    from .resource_index import resource_index, get_index, load_course_resources, watch_resources
+    from .parse_cache import parse_cache, cached_extract, cache_stats
+    from .parse_jobs import parse_job, submit_parse
+    from .guard import parse_guard, parse_limit_error, default_guard, guarded_extract
@@ -0,0 +1,116 @@
+from math import comb, prod
+from bisect import insort
+from typing import Callable, Iterable, Optional
+from functools import lru_cache
+from .catalog import cst_st, ss_st, science_st
+
+MAX_CODS = 5
+STREAMS = ("arts", "ss", "cst", "science")
+
+def stream_pools(arts_session):
+    # Same precedence as cod_planner's classification, so a course listed in
+    # two streams is only ever counted once.
+    pools = {}
+    seen = set()
+    for stream, courses in (("cst", cst_st), ("arts", arts_session), ("science", science_st), ("ss", ss_st)):
+        pools[stream] = tuple(sorted(set(courses) - seen))
+        seen.update(courses)
+    return pools
+
+def coverage_score(plan, counts):
+    return sum(1 for stream in STREAMS if counts[stream])
+
+def stream_splits(remaining, have):
+    cst_room = max(0, 1 - have["cst"])
+    for arts in range(int(not have["arts"]), remaining + 1):
+        for ss in range(int(not have["ss"]), remaining - arts + 1):
+            for cst in range(0, min(cst_room, remaining - arts - ss) + 1):
+                yield {"arts": arts, "ss": ss, "cst": cst, "science": remaining - arts - ss - cst}
+
+def split_plans(courses, stream_of, split):
+    # Every plan with exactly split[stream] courses per stream, as sorted
+    # tuples in lexicographic order. `courses` is sorted, so picking indices
+    # in increasing order walks the tuples in that order.
+    left = [dict.fromkeys(STREAMS, 0) for _ in range(len(courses) + 1)]
+    for i in range(len(courses) - 1, -1, -1):
+        left[i] = dict(left[i + 1])
+        left[i][stream_of[courses[i]]] += 1
+    need = dict(split)
+    picked = []
+
+    def walk(start):
+        if len(picked) == sum(split.values()):
+            yield tuple(picked)
+            return
+        for i in range(start, len(courses)):
+            if any(need[stream] > left[i][stream] for stream in STREAMS):
+                return
+            stream = stream_of[courses[i]]
+            if need[stream]:
+                need[stream] -= 1
+                picked.append(courses[i])
+                yield from walk(i + 1)
+                picked.pop()
+                need[stream] += 1
+
+    return walk(0)
+
+@lru_cache(maxsize=256)
+def ranked_cod_plans(taken, arts_session, score=coverage_score, limit=10, bound=None):
+    pools = stream_pools(arts_session)
+    have = {stream: sum(1 for c in pools[stream] if c in taken) for stream in STREAMS}
+    remaining = MAX_CODS - sum(have.values())
+    if remaining <= 0:
+        return 0, ()
+    open_courses = {stream: [c for c in pools[stream] if c not in taken] for stream in STREAMS}
+    stream_of = {c: stream for stream in STREAMS for c in open_courses[stream]}
+    courses = sorted(stream_of)
+    if bound is None:
+        # The default score only looks at the counts, so it bounds itself;
+        # any other score is assumed unbounded and every split is walked.
+        bound = (lambda counts: coverage_score((), counts)) if score is coverage_score else (lambda counts: float("inf"))
+
+    splits = []
+    found = 0
+    for split in stream_splits(remaining, have):
+        size = prod(comb(len(open_courses[stream]), split[stream]) for stream in STREAMS)
+        if size:
+            found += size
+            counts = {stream: have[stream] + split[stream] for stream in STREAMS}
+            splits.append((bound(counts), split, counts))
+    if limit < 1:
+        return found, ()
+    splits.sort(key=lambda s: -s[0])
+
+    # The best `limit` (-score, plan) keys so far, kept sorted: higher score
+    # first, ties broken by the course codes.
+    best = []
+    counts_of = {}
+    for ceiling, split, counts in splits:
+        if len(best) == limit and -ceiling > best[-1][0]:
+            break
+        for plan in split_plans(courses, stream_of, split):
+            # Later plans in this split sort after this one and score at most
+            # `ceiling`, so once this key cannot get in, none of them can.
+            if len(best) == limit and (-ceiling, plan) >= best[-1]:
+                break
+            key = (-score(plan, counts), plan)
+            if len(best) < limit or key < best[-1]:
+                insort(best, key)
+                counts_of[plan] = counts
+                if len(best) > limit:
+                    best.pop()
+    return found, tuple((plan, -negative, counts_of[plan]) for negative, plan in best)
+
+def cod_plans(courses_done: Iterable[str], arts_session: Iterable[str],
+              score: Callable[[tuple[str, ...], dict[str, int]], float] = coverage_score, limit: int = 10,
+              bound: Optional[Callable[[dict[str, int]], float]] = None) -> dict:
+    # `bound(counts)` is an upper bound on `score` for any plan with those
+    # stream counts; with one, splits that cannot reach the top are skipped.
+    pools = stream_pools(arts_session)
+    cods = frozenset(c for c in courses_done if any(c in pools[s] for s in STREAMS))
+    count, ranked = ranked_cod_plans(cods, frozenset(arts_session), score, limit, bound)
+    return {
+        "count": count,
+        "plans": [{"courses": list(plan), "score": value, "counts": dict(counts)} for plan, value, counts in ranked],
+    }
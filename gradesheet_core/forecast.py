@@ -0,0 +1,149 @@
+import os
+import json
+import math
+import numpy as np
+from typing import Mapping, Optional
+from concurrent.futures import Executor
+from .catalog import core, comp_cod, cs_elective, grade_points
+from .parser import courses_map
+from .planner import course_totals
+
+# A+ and A carry the same points, so sampling only needs the distinct values.
+grade_labels = [g for g in grade_points if g != "A+"]
+grade_values = np.array([grade_points[g] for g in grade_labels])
+
+CHUNK_TRIALS = 50_000
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+ELECTIVE_SLOT = "ELECTIVE"
+
+def remaining_courses(courses_done, dept="CSE", total_required_credits=136):
+    core_set = core if dept == "CSE" else core - cs_elective
+    courses = sorted((core_set | comp_cod) - set(courses_done))
+    credits = [3.0] * len(courses)
+
+    # Whatever the named requirements leave uncovered goes to elective/COD
+    # slots, which have no course of their own and are sampled from the prior.
+    earned_credits, _ = course_totals(courses_done)
+    open_credits = total_required_credits - earned_credits - sum(credits)
+    while open_credits > 0:
+        courses.append(ELECTIVE_SLOT)
+        credits.append(min(3.0, open_credits))
+        open_credits -= 3.0
+    return courses, np.array(credits)
+
+def history_distribution(courses_done, min_std=0.25):
+    gpas = np.array([node.gpa for node in courses_done.values()], dtype=np.float64)
+    mean = float(gpas.mean()) if len(gpas) else 3.0
+    std = max(float(gpas.std()), min_std) if len(gpas) > 1 else 0.5
+
+    # Discretise a normal fit of the student's own grades onto the grade scale:
+    # each grade takes the mass between the midpoints to its neighbours.
+    order = np.argsort(grade_values)
+    cuts = (grade_values[order][1:] + grade_values[order][:-1]) / 2
+    cdf = np.array([0.5 * (1 + math.erf((c - mean) / (std * math.sqrt(2)))) for c in cuts])
+    mass = np.diff(np.concatenate([[0.0], cdf, [1.0]]))
+    probs = np.empty(len(grade_values))
+    probs[order] = mass
+    return probs
+
+def load_grade_counts(path: str) -> dict[str, dict[str, float]]:
+    counts = {}
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            # Output of batch_extract.py: one parsed gradesheet per line.
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                for row in json.loads(line).get("courses", []):
+                    grade = "A" if row["grade"] == "A+" else row["grade"]
+                    course = counts.setdefault(row["course"], {})
+                    course[grade] = course.get(grade, 0) + 1
+        else:
+            counts = json.load(f)
+
+    table = {}
+    for course, by_grade in counts.items():
+        row = np.zeros(len(grade_labels))
+        for grade, n in by_grade.items():
+            grade = "A" if grade == "A+" else grade
+            if grade in grade_labels:
+                row[grade_labels.index(grade)] += n
+        table[course] = row
+    return table
+
+def course_distributions(courses, courses_done, grade_counts=None, prior_weight=5.0):
+    prior = history_distribution(courses_done)
+    probs = np.tile(prior, (len(courses), 1))
+    if grade_counts:
+        # Blend the empirical counts with the student's own fit so thinly
+        # observed courses lean on the student rather than on a handful of rows.
+        for i, course in enumerate(courses):
+            counts = grade_counts.get(course)
+            if counts is not None and counts.sum():
+                probs[i] = (counts + prior_weight * prior) / (counts.sum() + prior_weight)
+    return probs
+
+def sample_points(cdf, credits, trials, seed):
+    rng = np.random.default_rng(seed)
+    points = np.zeros(trials)
+    for j in range(len(credits)):
+        picks = np.searchsorted(cdf[j], rng.random(trials), side="right")
+        points += grade_values[np.minimum(picks, len(grade_values) - 1)] * credits[j]
+    return points
+
+def forecast_cgpa(courses_done: courses_map, target_cgpa: Optional[float] = None, trials: int = 100_000,
+                  dept: str = "CSE", total_required_credits: float = 136,
+                  grade_counts: Optional[Mapping[str, Mapping[str, float]]] = None, seed: Optional[int] = None,
+                  workers: Optional[int] = None, executor: Optional[Executor] = None) -> dict:
+    trials = max(int(trials), 1)
+    courses, credits = remaining_courses(courses_done, dept, total_required_credits)
+    probs = course_distributions(courses, courses_done, grade_counts)
+    cdf = np.cumsum(probs, axis=1)
+
+    earned_credits, earned_points = course_totals(courses_done)
+    total_credits = earned_credits + credits.sum()
+
+    # Trials are split into fixed-size chunks, each with its own spawned seed,
+    # so the result depends on the seed alone and not on how many workers ran.
+    sizes = [CHUNK_TRIALS] * (trials // CHUNK_TRIALS)
+    if trials % CHUNK_TRIALS:
+        sizes.append(trials % CHUNK_TRIALS)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(cdf, credits, n, s) for n, s in zip(sizes, seeds)]
+
+    if executor is not None or (workers and workers > 1 and len(jobs) > 1):
+        if executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunks = list(pool.map(sample_points, *zip(*jobs)))
+        else:
+            chunks = list(executor.map(sample_points, *zip(*jobs)))
+    else:
+        chunks = [sample_points(*job) for job in jobs]
+
+    points = np.concatenate(chunks)
+    cgpas = (earned_points + points) / total_credits if total_credits else np.zeros(len(points))
+
+    counts, edges = np.histogram(cgpas, bins=40, range=(0.0, 4.0))
+    result = {
+        "trials": trials,
+        "courses": courses,
+        "credits": float(credits.sum()),
+        "mean": round(float(cgpas.mean()), 2),
+        "std": round(float(cgpas.std()), 3),
+        "percentiles": {p: round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(cgpas, PERCENTILES))},
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
+    if target_cgpa is not None:
+        target_cgpa = round(target_cgpa, 2)
+        result["target"] = target_cgpa
+        result["p_target"] = round(float((np.round(cgpas, 2) >= target_cgpa).mean()), 4)
+    return result
+
+def default_grade_counts() -> Optional[dict[str, dict[str, float]]]:
+    path = os.environ.get("GRADESHEET_GRADE_DATA")
+    if path and os.path.exists(path):
+        return load_grade_counts(path)
+    return None
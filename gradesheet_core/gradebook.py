@@ -0,0 +1,472 @@
+import hashlib
+import numpy as np
+
+VIRTUAL_SEMESTER = "VIRTUAL SEMESTER"
+
+# Columns of grade_book.semester_stats
+SEM_CREDIT, SEM_GPA, SEM_CGPA = 0, 1, 2
+# Columns of grade_book.semester_totals
+SEM_POINTS, SEM_CREDITS, SEM_COUNT = 0, 1, 2
+
+def to_centi(value):
+    return int(round(value * 100))
+
+def centi_ratio(points, credits):
+    # points are in 1/10000ths and credits in 1/100ths, so the quotient is a
+    # GPA in 1/100ths; rounded half up with integer arithmetic only.
+    return (2 * points + credits) // (2 * credits) if credits else 0
+
+class course_view:
+    __slots__ = ("book", "row")
+
+    def __init__(self, book, row):
+        self.book = book
+        self.row = row
+
+    @property
+    def course(self):
+        return self.book.code_table[self.book.course[self.row]]
+
+    @property
+    def grade(self):
+        return self.book.grade_table[self.book.grade[self.row]]
+
+    @grade.setter
+    def grade(self, value):
+        self.book.grade[self.row] = self.book.intern_grade(value)
+
+    @property
+    def gpa(self):
+        return int(self.book.gpa_centi[self.row]) / 100
+
+    @gpa.setter
+    def gpa(self, value):
+        self.book.update_row(self.row, gpa=value)
+
+    @property
+    def credit(self):
+        return int(self.book.credit_centi[self.row]) / 100
+
+    @credit.setter
+    def credit(self, value):
+        self.book.update_row(self.row, credit=value)
+
+    def display(self):
+        print(self.course, self.grade, self.gpa, self.credit)
+
+class semester_view:
+    __slots__ = ("book", "sid")
+
+    def __init__(self, book, sid):
+        self.book = book
+        self.sid = sid
+
+    @property
+    def semester(self):
+        return self.book.semester_names[self.sid]
+
+    @property
+    def courses(self):
+        return [course_view(self.book, row) for row in self.book.semester_rows(self.sid)]
+
+    @property
+    def credit(self):
+        return float(self.book.semester_stats[self.sid, SEM_CREDIT])
+
+    @credit.setter
+    def credit(self, value):
+        self.book.semester_stats[self.sid, SEM_CREDIT] = value
+
+    @property
+    def gpa(self):
+        return float(self.book.semester_stats[self.sid, SEM_GPA])
+
+    @gpa.setter
+    def gpa(self, value):
+        self.book.semester_stats[self.sid, SEM_GPA] = value
+
+    @property
+    def cgpa(self):
+        return float(self.book.semester_stats[self.sid, SEM_CGPA])
+
+    @cgpa.setter
+    def cgpa(self, value):
+        self.book.semester_stats[self.sid, SEM_CGPA] = value
+
+    def display(self):
+        print(self.semester)
+        for course in self.courses:
+            print(course.course, end=" ")
+        print(self.credit, self.gpa, self.cgpa)
+
+class semester_map:
+    __slots__ = ("book",)
+
+    def __init__(self, book):
+        self.book = book
+
+    def __getitem__(self, name):
+        return semester_view(self.book, self.book.semester_order[name])
+
+    def __setitem__(self, name, node):
+        sid = self.book.add_semester(name)
+        self.book.semester_stats[sid] = (node.credit, node.gpa, node.cgpa)
+        for course in node.courses:
+            self.book.append(course.course, course.grade, course.gpa, course.credit, sid)
+
+    def __delitem__(self, name):
+        self.book.drop_semester(name)
+
+    def __contains__(self, name):
+        return name in self.book.semester_order
+
+    def __iter__(self):
+        return iter(self.book.semester_order)
+
+    def __len__(self):
+        return len(self.book.semester_order)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def keys(self):
+        return self.book.semester_order.keys()
+
+    def values(self):
+        return [semester_view(self.book, sid) for sid in self.book.semester_order.values()]
+
+    def items(self):
+        return [(name, semester_view(self.book, sid)) for name, sid in self.book.semester_order.items()]
+
+class grade_book:
+    def __init__(self, capacity=64):
+        self.code_table = []
+        self.code_lookup = {}
+        self.grade_table = []
+        self.grade_lookup = {}
+
+        # One row per course attempt; `current` maps a course code to the row
+        # that counts towards the CGPA, the rest are kept as semester history.
+        # GPA and credit are stored in hundredths so all totals stay exact.
+        self.course = np.zeros(capacity, dtype=np.int16)
+        self.grade = np.zeros(capacity, dtype=np.int8)
+        self.credit_centi = np.zeros(capacity, dtype=np.int32)
+        self.gpa_centi = np.zeros(capacity, dtype=np.int32)
+        self.semester = np.full(capacity, -1, dtype=np.int16)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.counted = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self.current = {}
+        self.placed = {}
+
+        # Running totals over the counted rows, updated on every change.
+        self.total_points = 0
+        self.total_credits = 0
+
+        self.semester_names = []
+        self.semester_order = {}
+        self.semester_stats = np.zeros((16, 3), dtype=np.float64)
+        self.semester_totals = np.zeros((16, 3), dtype=np.int64)
+        self.semesters = semester_map(self)
+
+    def to_dict(self):
+        # Plain JSON-able state, so a book can be stored without pickle.
+        n = self.size
+        names = self.semester_names
+        return {
+            "code_table": list(self.code_table),
+            "grade_table": list(self.grade_table),
+            "course": self.course[:n].tolist(),
+            "grade": self.grade[:n].tolist(),
+            "gpa_centi": self.gpa_centi[:n].tolist(),
+            "credit_centi": self.credit_centi[:n].tolist(),
+            "semester": self.semester[:n].tolist(),
+            "live": self.live[:n].tolist(),
+            "current": list(self.current.items()),
+            "semester_names": list(names),
+            "semester_order": list(self.semester_order.items()),
+            "semester_stats": self.semester_stats[:len(names)].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        n = len(state["course"])
+        book = cls(capacity=max(64, n))
+        book.semester_names = list(state["semester_names"])
+        slots = max(16, len(book.semester_names))
+        book.semester_stats = np.zeros((slots, 3), dtype=np.float64)
+        book.semester_totals = np.zeros((slots, 3), dtype=np.int64)
+        book.semester_stats[:len(book.semester_names)] = state["semester_stats"]
+        book.semester_order = {name: int(sid) for name, sid in state["semester_order"]}
+
+        book.code_table = list(state["code_table"])
+        book.code_lookup = {code: i for i, code in enumerate(book.code_table)}
+        book.grade_table = list(state["grade_table"])
+        book.grade_lookup = {grade: i for i, grade in enumerate(book.grade_table)}
+        if len(book.code_lookup) != len(book.code_table) or len(book.grade_lookup) != len(book.grade_table):
+            raise ValueError("duplicate entries in the intern tables")
+        book.course[:n] = state["course"]
+        book.grade[:n] = state["grade"]
+        if n and not (0 <= book.course[:n].min() and book.course[:n].max() < len(book.code_table)
+                      and 0 <= book.grade[:n].min() and book.grade[:n].max() < len(book.grade_table)):
+            raise ValueError("row refers to a missing course code or grade")
+        book.gpa_centi[:n] = state["gpa_centi"]
+        book.credit_centi[:n] = state["credit_centi"]
+        book.semester[:n] = state["semester"]
+        book.live[:n] = state["live"]
+        book.size = n
+        if n and book.semester[:n].max() >= len(book.semester_names):
+            raise ValueError("row refers to a missing semester")
+
+        points = book.gpa_centi[:n].astype(np.int64) * book.credit_centi[:n]
+        placed = np.flatnonzero(book.live[:n] & (book.semester[:n] >= 0))
+        sids = book.semester[placed]
+        np.add.at(book.semester_totals[:, SEM_POINTS], sids, points[placed])
+        np.add.at(book.semester_totals[:, SEM_CREDITS], sids, book.credit_centi[placed])
+        np.add.at(book.semester_totals[:, SEM_COUNT], sids, 1)
+        book.placed = dict(zip(zip(sids.tolist(), book.course[placed].tolist()), placed.tolist()))
+
+        book.current = {code: int(row) for code, row in state["current"]}
+        if not all(0 <= row < n for row in book.current.values()):
+            raise ValueError("current course refers to a missing row")
+        counted = np.fromiter(book.current.values(), dtype=np.intp, count=len(book.current))
+        book.counted[counted] = True
+        book.total_points = int(points[counted].sum())
+        book.total_credits = int(book.credit_centi[counted].sum())
+        return book
+
+    def intern_code(self, code):
+        index = self.code_lookup.get(code)
+        if index is None:
+            index = self.code_lookup[code] = len(self.code_table)
+            self.code_table.append(code)
+        return index
+
+    def intern_grade(self, grade):
+        index = self.grade_lookup.get(grade)
+        if index is None:
+            index = self.grade_lookup[grade] = len(self.grade_table)
+            self.grade_table.append(grade)
+        return index
+
+    def grow(self):
+        capacity = 2 * len(self.gpa_centi)
+        for column in ("course", "grade", "credit_centi", "gpa_centi", "semester", "live", "counted"):
+            old = getattr(self, column)
+            new = np.full(capacity, -1 if column == "semester" else 0, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, column, new)
+
+    def row_points(self, row):
+        return int(self.gpa_centi[row]) * int(self.credit_centi[row])
+
+    def append(self, code, grade, gpa, credit, sid=-1):
+        if self.size == len(self.gpa_centi):
+            self.grow()
+        row = self.size
+        self.course[row] = self.intern_code(code)
+        self.grade[row] = self.intern_grade(grade)
+        self.gpa_centi[row] = to_centi(gpa)
+        self.credit_centi[row] = to_centi(credit)
+        self.semester[row] = sid
+        self.live[row] = True
+        self.size += 1
+        if sid >= 0:
+            self.place(row)
+        return row
+
+    def place(self, row):
+        sid = int(self.semester[row])
+        self.semester_totals[sid] += (self.row_points(row), int(self.credit_centi[row]), 1)
+        self.placed[(sid, int(self.course[row]))] = row
+
+    def unplace(self, row):
+        sid = int(self.semester[row])
+        self.semester_totals[sid] -= (self.row_points(row), int(self.credit_centi[row]), 1)
+        key = (sid, int(self.course[row]))
+        if self.placed.get(key) == row:
+            del self.placed[key]
+
+    def count(self, code, row):
+        old = self.current.get(code)
+        if old is not None:
+            self.release(old)
+        # Plain assignment keeps a replaced course in its original position.
+        self.current[code] = row
+        self.counted[row] = True
+        self.total_points += self.row_points(row)
+        self.total_credits += int(self.credit_centi[row])
+        return old
+
+    def uncount(self, code):
+        row = self.current.pop(code)
+        self.release(row)
+        return row
+
+    def release(self, row):
+        self.counted[row] = False
+        self.total_points -= self.row_points(row)
+        self.total_credits -= int(self.credit_centi[row])
+        if self.semester[row] < 0:
+            self.live[row] = False
+
+    def update_row(self, row, gpa=None, credit=None):
+        placed = self.live[row] and self.semester[row] >= 0
+        if placed:
+            self.unplace(row)
+        if self.counted[row]:
+            self.total_points -= self.row_points(row)
+            self.total_credits -= int(self.credit_centi[row])
+
+        if gpa is not None:
+            self.gpa_centi[row] = to_centi(gpa)
+        if credit is not None:
+            self.credit_centi[row] = to_centi(credit)
+
+        if placed:
+            self.place(row)
+        if self.counted[row]:
+            self.total_points += self.row_points(row)
+            self.total_credits += int(self.credit_centi[row])
+
+    def add_semester(self, name):
+        sid = len(self.semester_names)
+        if sid == len(self.semester_stats):
+            self.semester_stats = np.vstack([self.semester_stats, np.zeros_like(self.semester_stats)])
+            self.semester_totals = np.vstack([self.semester_totals, np.zeros_like(self.semester_totals)])
+        self.semester_names.append(name)
+        self.semester_order[name] = sid
+        return sid
+
+    def drop_semester(self, name):
+        sid = self.semester_order.pop(name)
+        for row in self.semester_rows(sid):
+            self.unplace(row)
+            if self.counted[row]:
+                self.semester[row] = -1
+            else:
+                self.live[row] = False
+
+    def semester_rows(self, sid):
+        n = self.size
+        return np.flatnonzero(self.live[:n] & (self.semester[:n] == sid))
+
+    def counted_rows(self):
+        return np.flatnonzero(self.counted[:self.size])
+
+    # courses_done compatibility: a mapping of course code -> course view
+    def __getitem__(self, code):
+        return course_view(self, self.current[code])
+
+    def __setitem__(self, code, node):
+        self.count(code, self.append(code, node.grade, node.gpa, node.credit))
+
+    def __delitem__(self, code):
+        self.uncount(code)
+
+    def __contains__(self, code):
+        return code in self.current
+
+    def __iter__(self):
+        return iter(self.current)
+
+    def __len__(self):
+        return len(self.current)
+
+    def get(self, code, default=None):
+        return self[code] if code in self.current else default
+
+    def keys(self):
+        return self.current.keys()
+
+    def values(self):
+        return [course_view(self, row) for row in self.current.values()]
+
+    def items(self):
+        return [(code, course_view(self, row)) for code, row in self.current.items()]
+
+    def fingerprint(self):
+        # Content digest of everything the derived views read: the counted
+        # rows in order, every semester row and the live semester table.
+        # Interned ids and semester ids depend on edit history, so rows are
+        # hashed through their tables to keep equal content equal.
+        h = hashlib.blake2b(digest_size=16)
+        n = self.size
+        counted = np.fromiter(self.current.values(), dtype=np.int64, count=len(self.current))
+        placed = np.flatnonzero(self.live[:n] & (self.semester[:n] >= 0))
+        names = self.semester_names
+        for rows in (counted, placed):
+            h.update("\0".join(self.code_table[c] for c in self.course[rows]).encode())
+            h.update("\0".join(self.grade_table[g] for g in self.grade[rows]).encode())
+            h.update("\0".join(names[s] if s >= 0 else "" for s in self.semester[rows]).encode())
+            h.update(self.gpa_centi[rows].tobytes())
+            h.update(self.credit_centi[rows].tobytes())
+        h.update("\0".join(self.semester_order).encode())
+        h.update(self.semester_stats[list(self.semester_order.values())].tobytes())
+        return h.hexdigest()
+
+    def totals(self):
+        return self.total_credits / 100, self.total_points / 10000
+
+    def cgpa(self):
+        return centi_ratio(self.total_points, self.total_credits) / 100
+
+    def refresh_semester(self, sid):
+        points, credits, _ = self.semester_totals[sid]
+        self.semester_stats[sid, SEM_GPA] = centi_ratio(int(points), int(credits)) / 100
+        self.semester_stats[sid, SEM_CGPA] = self.cgpa()
+
+    def add_course(self, code, gpa_val, semester=VIRTUAL_SEMESTER):
+        credit = 4 if code == "CSE400" else 3
+
+        if code in self.current:
+            self.remove_course(code, semester)
+
+        if semester not in self.semester_order:
+            self.add_semester(semester)
+        sid = self.semester_order[semester]
+
+        self.count(code, self.append(code, "F", gpa_val, credit, sid))
+        self.semester_stats[sid, SEM_CREDIT] += credit
+        self.refresh_semester(sid)
+
+    def remove_course(self, code, semester=VIRTUAL_SEMESTER):
+        if code not in self.current or semester not in self.semester_order:
+            return
+
+        sid = self.semester_order[semester]
+        row = self.placed.get((sid, self.code_lookup[code]))
+        if row is None:
+            return
+
+        self.unplace(row)
+        self.live[row] = False
+        self.semester_stats[sid, SEM_CREDIT] -= int(self.credit_centi[row]) / 100
+        self.uncount(code)
+        self.refresh_semester(sid)
+
+        if not self.semester_totals[sid, SEM_COUNT]:
+            self.drop_semester(semester)
+
+    def simulate_retake(self, regrades):
+        points = self.total_points
+        for code, gpa in regrades.items():
+            row = self.current.get(code)
+            if row is not None:
+                points += (to_centi(gpa) - int(self.gpa_centi[row])) * int(self.credit_centi[row])
+        return centi_ratio(points, self.total_credits) / 100
+
+    def simulate_retake_batch(self, codes, scenarios):
+        scenarios = np.asarray(scenarios, dtype=np.float64).reshape(-1, len(codes))
+        rows = np.fromiter((self.current[code] for code in codes), dtype=np.intp, count=len(codes))
+        credits = self.credit_centi[rows].astype(np.int64)
+        gpas = self.gpa_centi[rows].astype(np.int64)
+
+        # NaN keeps the current grade for that course in that scenario.
+        keep = np.isnan(scenarios)
+        regrades = np.rint(np.where(keep, 0.0, scenarios) * 100).astype(np.int64)
+        delta = np.where(keep, 0, regrades - gpas) @ credits
+        points = self.total_points + delta
+        if not self.total_credits:
+            return np.zeros(len(scenarios))
+        return ((2 * points + self.total_credits) // (2 * self.total_credits)) / 100
@@ -0,0 +1,226 @@
+import os
+import sys
+import time
+import threading
+import subprocess
+from typing import Optional
+from .parser import extract, read_pdf_bytes, parse_cancelled, pdf_source, parse_result, progress_hook
+
+try:
+    import resource
+    from multiprocessing.connection import Connection
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class parse_limit_error(Exception):
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+
+class worker_lost(Exception):
+    pass
+
+def sandboxed_extract(conn, data, max_pages, memory_mb, layout):
+    def progress(done, total):
+        if total > max_pages:
+            raise parse_limit_error("pages", f"The PDF has {total} pages; gradesheets are limited to {max_pages}.")
+        conn.send(("progress", done, total))
+
+    try:
+        conn.send(("ok", extract(data, layout=layout, progress=progress)))
+    except parse_limit_error as e:
+        conn.send(("limit", e.limit, str(e)))
+    except Exception as e:
+        # MuPDF reports a refused allocation as a RuntimeError ("malloc ... failed").
+        if isinstance(e, MemoryError) or (memory_mb and "alloc" in str(e) and "failed" in str(e)):
+            conn.send(("limit", "memory", f"Parsing needed more than {memory_mb:g} MB and was stopped."))
+        else:
+            conn.send(("error", type(e).__name__, str(e)))
+
+def serve(read_fd, write_fd, memory_mb):
+    # Worker side: parses one PDF at a time until the parent closes the pipe.
+    # PyMuPDF is loaded before the cap so the cap only has to cover parsing.
+    import fitz
+    if memory_mb:
+        ceiling = int(memory_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (ceiling, ceiling))
+
+    inbox = Connection(read_fd, writable=False)
+    outbox = Connection(write_fd, readable=False)
+    while True:
+        try:
+            data, max_pages, layout = inbox.recv()
+        except EOFError:
+            return
+        except MemoryError:
+            # The PDF alone does not fit under the cap. The rest of it is still
+            # in the pipe, so this worker cannot take another one.
+            outbox.send(("limit", "memory", f"Parsing needed more than {memory_mb:g} MB and was stopped."))
+            return
+        sandboxed_extract(outbox, data, max_pages, memory_mb, layout)
+
+class sandbox_worker:
+    def __init__(self, memory_mb):
+        # A fresh interpreter rather than multiprocessing: under `streamlit run`
+        # __main__ is the app script, which spawn and forkserver children
+        # would execute again, and a fork would carry the app's whole heap
+        # into the address-space limit.
+        to_child, inbox = os.pipe()
+        outbox, from_child = os.pipe()
+        path = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "gradesheet_core.guard", str(to_child), str(from_child), str(memory_mb)],
+            pass_fds=(to_child, from_child), stdin=subprocess.DEVNULL, env=dict(os.environ, PYTHONPATH=path),
+        )
+        os.close(to_child)
+        os.close(from_child)
+        self.send = Connection(inbox, readable=False)
+        self.recv = Connection(outbox, writable=False)
+        self.uses = 0
+        self.alive = True
+
+    def close(self):
+        self.alive = False
+        self.send.close()
+        self.recv.close()
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+
+    def parse(self, data, max_pages, layout, timeout, progress):
+        self.uses += 1
+        deadline = time.monotonic() + timeout
+        # Until the worker answers for this PDF it may still be busy with
+        # it, so any way out of here other than an answer retires it.
+        answered = False
+        try:
+            try:
+                self.send.send((data, max_pages, layout))
+            except OSError as e:
+                # Died while idle; the PDF never reached it, so it is safe to retry.
+                raise worker_lost(e)
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0 or not self.recv.poll(remaining):
+                        raise parse_limit_error("time", f"Parsing took longer than {timeout:g}s and was stopped.")
+                    message = self.recv.recv()
+                except (EOFError, OSError) as e:
+                    if not isinstance(e, EOFError):
+                        self.proc.kill()
+                    self.proc.wait()
+                    raise parse_limit_error("crash", f"The parser stopped unexpectedly on this PDF "
+                                                     f"(exit code {self.proc.returncode}).")
+                if message[0] == "progress":
+                    if progress is not None and progress(message[1], message[2]) is False:
+                        raise parse_cancelled(f"parse cancelled after {message[1]} of {message[2]} pages")
+                    continue
+                # Past the memory ceiling the worker's heap is suspect.
+                answered = message[:2] != ("limit", "memory")
+                if message[0] == "ok":
+                    return message[1]
+                if message[0] == "limit":
+                    raise parse_limit_error(message[1], message[2])
+                raise ValueError(f"could not parse gradesheet: {message[1]}: {message[2]}")
+        finally:
+            if not answered:
+                self.close()
+
+class parse_guard:
+    def __init__(self, max_parses=None, max_pages=40, timeout=20.0, memory_mb=512, max_mb=10, wait=0.0,
+                 max_uses=200):
+        self.max_parses = max_parses or os.cpu_count() or 1
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.wait = wait
+        self.max_uses = max_uses
+        self.slots = threading.BoundedSemaphore(self.max_parses)
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def checkout(self):
+        with self.lock:
+            while self.idle:
+                worker = self.idle.pop()
+                if worker.proc.poll() is None:
+                    return worker
+                # Killed while idle (OOM killer, an operator); start a fresh one instead.
+                worker.close()
+        return sandbox_worker(self.memory_mb)
+
+    def checkin(self, worker):
+        if worker.alive and worker.uses < self.max_uses:
+            with self.lock:
+                if len(self.idle) < self.max_parses:
+                    self.idle.append(worker)
+                    return
+        if worker.alive:
+            worker.close()
+
+    def warm(self, count=None):
+        # Starting a worker costs an interpreter and a PyMuPDF import; a
+        # server can pay that up front instead of on its first uploads.
+        if resource is not None:
+            for worker in [self.checkout() for _ in range(count or self.max_parses)]:
+                self.checkin(worker)
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for worker in idle:
+            worker.close()
+
+    def page_cap(self, progress):
+        def capped(done, total):
+            if total > self.max_pages:
+                raise parse_limit_error("pages", f"The PDF has {total} pages; gradesheets are limited to "
+                                                 f"{self.max_pages}.")
+            return progress(done, total) if progress is not None else None
+        return capped
+
+    def extract(self, source: pdf_source, layout: bool = False,
+                progress: Optional[progress_hook] = None) -> parse_result:
+        data = read_pdf_bytes(source)
+        if len(data) > self.max_bytes:
+            raise parse_limit_error("size", f"The PDF is {len(data) / 2**20:.1f} MB; uploads are limited to "
+                                            f"{self.max_bytes / 2**20:g} MB.")
+        # Admission control: past max_parses the caller is turned away after
+        # `wait` seconds rather than queued behind work it cannot see.
+        if not self.slots.acquire(timeout=self.wait):
+            raise parse_limit_error("busy", "Too many gradesheets are being parsed right now. Try again shortly.")
+        try:
+            if resource is None:
+                # No rlimits or fd passing on Windows: only the page cap
+                # applies and the parse runs in this process.
+                return extract(data, layout=layout, progress=self.page_cap(progress))
+            for retry in (True, False):
+                worker = self.checkout()
+                try:
+                    return worker.parse(data, self.max_pages, layout, self.timeout, progress)
+                except worker_lost:
+                    if not retry:
+                        raise parse_limit_error("crash", "The parser could not be started. Try again shortly.")
+                finally:
+                    self.checkin(worker)
+        finally:
+            self.slots.release()
+
+default_guard = parse_guard(
+    max_parses=int(os.environ.get("GRADESHEET_MAX_PARSES", 0)) or None,
+    max_pages=int(os.environ.get("GRADESHEET_MAX_PAGES", 40)),
+    timeout=float(os.environ.get("GRADESHEET_PARSE_TIMEOUT", 20)),
+    memory_mb=float(os.environ.get("GRADESHEET_PARSE_MEMORY_MB", 512)),
+    max_mb=float(os.environ.get("GRADESHEET_MAX_PDF_MB", 10)),
+    wait=float(os.environ.get("GRADESHEET_PARSE_WAIT", 0)),
+)
+
+def guarded_extract(source: pdf_source, layout: bool = False,
+                    progress: Optional[progress_hook] = None) -> parse_result:
+    return default_guard.extract(source, layout, progress)
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]), int(sys.argv[2]), float(sys.argv[3]))
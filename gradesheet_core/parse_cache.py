@@ -0,0 +1,127 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from .gradebook import grade_book
+from .parser import extract, read_pdf_bytes, pdf_source, parse_result
+
+# Bump when the shape of extract()'s result changes so stale disk entries are ignored.
+CACHE_VERSION = 5
+
+# Entries are JSON rather than pickle: anyone who can write to the cache
+# directory could otherwise run code in the app by planting an entry.
+def dump_result(result):
+    name, id, book, _ = result
+    return json.dumps({"name": name, "id": id, "book": book.to_dict()}, separators=(",", ":")).encode()
+
+def load_result(blob):
+    entry = json.loads(blob)
+    book = grade_book.from_dict(entry["book"])
+    return entry["name"], entry["id"], book, book.semesters
+
+class parse_cache:
+    def __init__(self, max_entries=128, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def disk_path(self, key):
+        return os.path.join(self.cache_dir, f"v{CACHE_VERSION}-{key}.json")
+
+    def remember(self, key, blob):
+        self.entries[key] = blob
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        with self.lock:
+            blob = self.entries.get(key)
+            if blob is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return load_result(blob)
+
+        if self.cache_dir:
+            try:
+                with open(self.disk_path(key), "rb") as f:
+                    blob = f.read()
+                result = load_result(blob)
+            except (OSError, ValueError, KeyError, TypeError, IndexError):
+                # Missing, truncated or hand-edited entries count as misses.
+                result = None
+            if result is not None:
+                with self.lock:
+                    self.remember(key, blob)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return result
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, result):
+        blob = dump_result(result)
+        with self.lock:
+            self.remember(key, blob)
+
+        if self.cache_dir:
+            path = self.disk_path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp, path)
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def extract(self, source, progress=None, parser=extract):
+        data = read_pdf_bytes(source)
+        key = self.key(data)
+        # Every hit is decoded afresh, so callers are free to mutate what they get back.
+        result = self.get(key)
+        if result is None:
+            result = parser(data, progress=progress)
+            self.put(key, result)
+        return result
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+default_cache = parse_cache(
+    max_entries=int(os.environ.get("GRADESHEET_CACHE_SIZE", 128)),
+    cache_dir=os.environ.get("GRADESHEET_CACHE_DIR") or None,
+)
+
+def cached_extract(source: pdf_source) -> parse_result:
+    return default_cache.extract(source)
+
+def cache_stats() -> dict:
+    return default_cache.stats()
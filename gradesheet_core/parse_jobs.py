@@ -0,0 +1,65 @@
+import threading
+from typing import Optional
+from concurrent.futures import CancelledError, Executor, ThreadPoolExecutor
+from .parser import parse_cancelled, parse_result
+from .parse_cache import default_cache
+from .guard import guarded_extract, default_guard
+
+# One pool for every session in the process, so a burst of uploads queues
+# here instead of running a parse per session all at once. It is sized to
+# the guard's slots: the guard does not wait for a slot, so extra threads
+# would turn queued uploads away as "busy" instead of holding them.
+PARSE_WORKERS = default_guard.max_parses
+executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+class parse_job:
+    def __init__(self):
+        self.future = None
+        self.pages_done = 0
+        self.page_count = 0
+        self.cancel_requested = threading.Event()
+
+    def progress(self, done, total):
+        self.pages_done, self.page_count = done, total
+        return not self.cancel_requested.is_set()
+
+    def run(self, data, cache):
+        if self.cancel_requested.is_set():
+            raise parse_cancelled("parse cancelled before it started")
+        # Uploads are untrusted: misses go through the sandboxed, size- and
+        # time-limited parse path.
+        return cache.extract(data, progress=self.progress, parser=guarded_extract)
+
+    def cancel(self):
+        # A queued job never starts; a running one stops at its next page.
+        self.cancel_requested.set()
+        self.future.cancel()
+
+    @property
+    def state(self):
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        if self.future.cancelled() or isinstance(self.future.exception(), parse_cancelled):
+            return "cancelled"
+        return "failed" if self.future.exception() else "done"
+
+    @property
+    def fraction(self):
+        if self.page_count:
+            return self.pages_done / self.page_count
+        # Cache hits finish without reporting any pages.
+        return 1.0 if self.done() else 0.0
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None) -> parse_result:
+        try:
+            return self.future.result(timeout)
+        except CancelledError:
+            raise parse_cancelled("parse cancelled before it started")
+
+def submit_parse(data: bytes, pool: Optional[Executor] = None, cache=default_cache) -> parse_job:
+    job = parse_job()
+    job.future = (pool or executor).submit(job.run, data, cache)
+    return job
@@ -0,0 +1,409 @@
+import os
+from itertools import chain
+from typing import BinaryIO, Callable, Iterable, Mapping, Optional, Union
+from concurrent.futures import Executor, ProcessPoolExecutor
+from .gradebook import grade_book, semester_map, semester_view
+from .catalog import preq, to_remove, grades
+
+class course_node:
+    def __init__(self, course, gpa=0.0, grade="F", credit=3):
+        self.course = course
+        self.grade = grade
+        self.gpa = gpa
+        self.credit = credit
+
+    def display(self):
+        print(self.course, self.grade, self.gpa, self.credit)
+
+class semester_node:
+    def __init__(self, semester):
+        self.semester = semester
+        self.courses = []
+        self.credit = 0
+        self.gpa = 0
+        self.cgpa = 0
+
+    def display(self):
+        print(self.semester)
+        for course in self.courses:
+            print(course.course, end=" ")
+        print(self.credit, self.gpa, self.cgpa)
+
+# What the planners accept as a transcript: the grade book extract() returns,
+# or plain dicts of the nodes above built by hand.
+courses_map = Union[grade_book, dict[str, course_node]]
+semesters_map = Union[semester_map, dict[str, semester_node]]
+pdf_source = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+parse_result = tuple[Optional[str], Optional[str], grade_book, semester_map]
+# Called as progress(pages_done, page_count); returning False cancels the parse.
+progress_hook = Callable[[int, int], Optional[bool]]
+
+class parse_cancelled(Exception):
+    pass
+
+def page_blocks(page, clip=None):
+    blocks = page.get_text("blocks", clip=clip)
+    return sorted(blocks, key=lambda b: (b[1], b[0]))
+
+def iter_blocks(pages):
+    for page in pages:
+        yield from page_blocks(page)
+
+def iter_lines(blocks):
+    for block in blocks:
+        for line in block[4].splitlines():
+            if line not in to_remove:
+                yield line
+
+def running_key(text):
+    # Page numbers change from page to page, so compare running text with digits masked.
+    return "".join("#" if ch.isdigit() else ch for ch in text.strip())
+
+def is_semester_header(block):
+    return block[4].split("\n", 1)[0] == "SEMESTER:"
+
+def is_table_text(text):
+    return any(classify_line(line)[0] not in (NUMBER, TEXT) for line in text.splitlines())
+
+def find_running_blocks(first, second, tolerance=2.0):
+    # Only the margins repeat: the banner above the first semester header and
+    # the footer below the last table row. Rows inside the table can line up
+    # with a similar row on the next page, so they are never candidates.
+    positions = {}
+    for block in second:
+        positions.setdefault(running_key(block[4]), []).append(block[1])
+
+    def repeats(block):
+        key = running_key(block[4])
+        return bool(key) and not is_table_text(block[4]) and \
+            any(abs(block[1] - y) <= tolerance for y in positions.get(key, ()))
+
+    header = next((i for i, b in enumerate(first) if is_semester_header(b)), len(first))
+    footer = len(first)
+    while footer > header and repeats(first[footer - 1]):
+        footer -= 1
+    return [b for b in first[:header] if repeats(b)], first[footer:]
+
+def table_region(page, first, top, bottom):
+    header = next((b for b in first if is_semester_header(b)), None)
+    if header is None:
+        return None
+
+    # Margin blocks never set the width, and only margin blocks set the height.
+    table = first[first.index(header):len(first) - len(bottom)]
+    x0 = min(b[0] for b in table) - 1
+    x1 = max(b[2] for b in table) + 1
+    y0 = max((b[3] for b in top), default=page.rect.y0)
+    y1 = min((b[1] for b in bottom), default=page.rect.y1)
+    return (x0, y0, x1, y1)
+
+def iter_layout_lines(blocks, running_keys):
+    for block in blocks:
+        if running_key(block[4]) in running_keys:
+            continue
+        for line in block[4].splitlines():
+            if line.strip():
+                yield line
+
+def layout_head(doc):
+    # The first two pages are read in full: page one holds the student details
+    # and the pair is enough to spot the banner and footer repeated on every page.
+    first = page_blocks(doc[0])
+    second = page_blocks(doc[1]) if doc.page_count > 1 else []
+    top, bottom = find_running_blocks(first, second)
+    running_keys = frozenset(running_key(b[4]) for b in top + bottom)
+    clip = table_region(doc[0], first, top, bottom)
+
+    header = next((i for i, b in enumerate(first) if is_semester_header(b)), len(first))
+    head = list(iter_layout_lines(first[:header], frozenset()))
+    head.extend(iter_layout_lines(first[header:], running_keys))
+    head.extend(iter_layout_lines(second, running_keys))
+    return head, min(doc.page_count, 2), clip, running_keys
+
+def iter_page_lines(pages, clip=None, running_keys=None):
+    for page in pages:
+        if running_keys is None:
+            yield from iter_lines(page_blocks(page))
+        else:
+            yield from iter_layout_lines(page_blocks(page, clip=clip), running_keys)
+
+# Token kinds produced by classify_line()
+NAME_LABEL = "name_label"
+ID_LABEL = "id_label"
+SEMESTER_HEADER = "semester_header"
+SEMESTER_SUMMARY = "semester_summary"
+CREDITS_EARNED = "credits_earned"
+CGPA_MARKER = "cgpa_marker"
+COURSE_CODE = "course_code"
+GRADE = "grade"
+NOT_TAKEN = "not_taken"
+NUMBER = "number"
+TEXT = "text"
+
+marker_kinds = {
+    "Name": NAME_LABEL,
+    "Student ID": ID_LABEL,
+    "SEMESTER:": SEMESTER_HEADER,
+    "SEMESTER": SEMESTER_SUMMARY,
+    "Credits Earned": CREDITS_EARNED,
+    "CGPA": CGPA_MARKER,
+}
+course_codes = frozenset(preq)
+grade_set = frozenset(grades)
+failing_grades = frozenset({"F", "I", "W"})
+
+def classify_line(line):
+    kind = marker_kinds.get(line)
+    if kind is not None:
+        return kind, line
+    if line in course_codes:
+        return COURSE_CODE, line
+    if line in grade_set:
+        return GRADE, line
+    if "(NT)" in line:
+        return NOT_TAKEN, line
+    if "(RP)" in line or "(RT)" in line:
+        return GRADE, line.split()[0]
+    try:
+        return NUMBER, float(line)
+    except ValueError:
+        return TEXT, line
+
+class transcript_parser:
+    def __init__(self):
+        self.name = None
+        self.id = None
+        self.book = grade_book()
+        self.state = "top"
+        self.skip = 0
+        self.capture = None
+        self.semester = None
+        self.course = None
+        self.credit = None
+        self.grade = None
+
+    def on_top(self, kind, value, line):
+        if kind == NAME_LABEL and self.name is None:
+            self.skip, self.capture = 1, "name"
+            return "capture"
+        if kind == ID_LABEL and self.id is None:
+            self.skip, self.capture = 1, "id"
+            return "capture"
+        if kind == SEMESTER_HEADER:
+            return "semester_name"
+        return "top"
+
+    def on_capture(self, kind, value, line):
+        if self.skip:
+            self.skip -= 1
+            return "capture"
+        setattr(self, self.capture, line)
+        return "top"
+
+    def on_semester_name(self, kind, value, line):
+        self.semester = semester_view(self.book, self.book.add_semester(line))
+        return "semester"
+
+    def on_semester(self, kind, value, line):
+        if kind == COURSE_CODE:
+            self.course, self.credit = line, None
+            return "course"
+        if kind == SEMESTER_SUMMARY:
+            return "summary"
+        if kind == CGPA_MARKER:
+            return "cgpa"
+        if kind == SEMESTER_HEADER:
+            # A semester that never reached its CGPA line; close it and start the next one.
+            self.close_semester()
+            return "semester_name"
+        return "semester"
+
+    def on_course(self, kind, value, line):
+        if kind == GRADE:
+            if value in failing_grades or self.credit is None:
+                return "semester"
+            self.grade = value
+            return "course_gpa"
+        if kind == NOT_TAKEN:
+            return "semester"
+        if kind in (COURSE_CODE, CGPA_MARKER, SEMESTER_HEADER):
+            # A row that never got its grade is dropped; the new token starts the next one.
+            return self.on_semester(kind, value, line)
+        self.credit = value if kind == NUMBER else None
+        return "course"
+
+    def on_course_gpa(self, kind, value, line):
+        if kind != NUMBER:
+            return self.on_semester(kind, value, line)
+        row = self.book.append(self.course, self.grade, value, self.credit, self.semester.sid)
+        self.book.count(self.course, row)
+        return "semester"
+
+    def on_summary(self, kind, value, line):
+        if kind == CREDITS_EARNED:
+            self.skip = 2
+            return "semester_gpa"
+        if kind in (CGPA_MARKER, SEMESTER_HEADER):
+            return self.on_semester(kind, value, line)
+        return "summary"
+
+    def on_semester_gpa(self, kind, value, line):
+        if self.skip:
+            self.skip -= 1
+            return "semester_gpa"
+        if kind != NUMBER:
+            return self.on_semester(kind, value, line)
+        self.semester.gpa = value
+        return "semester"
+
+    def on_cgpa(self, kind, value, line):
+        if kind == NUMBER:
+            self.semester.cgpa = value
+        self.close_semester()
+        if kind == NUMBER:
+            return "top"
+        return self.on_top(kind, value, line)
+
+    def close_semester(self):
+        self.semester.credit = sum(4 if c.course == "CSE400" else 3 for c in self.semester.courses)
+        self.semester = None
+
+    handlers = {
+        "top": on_top,
+        "capture": on_capture,
+        "semester_name": on_semester_name,
+        "semester": on_semester,
+        "course": on_course,
+        "course_gpa": on_course_gpa,
+        "summary": on_summary,
+        "semester_gpa": on_semester_gpa,
+        "cgpa": on_cgpa,
+    }
+
+    def feed(self, line):
+        kind, value = classify_line(line)
+        self.state = self.handlers[self.state](self, kind, value, line)
+
+    def finish(self):
+        if self.semester is not None:
+            self.close_semester()
+        self.book.add_semester("NULL")
+        return self.name, self.id, self.book, self.book.semesters
+
+def parse_lines(lines: Iterable[str]) -> parse_result:
+    parser = transcript_parser()
+    for line in lines:
+        parser.feed(line)
+    return parser.finish()
+
+def read_pdf_bytes(source: pdf_source) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        return source.read()
+    with open(source, "rb") as f:
+        return f.read()
+
+def open_pdf(source):
+    # PyMuPDF is only loaded once there is a PDF to open, so planners and the
+    # grade book can be imported without it.
+    import fitz
+
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    return fitz.open(stream=read_pdf_bytes(source), filetype="pdf")
+
+def page_range_lines(source, start, stop, clip=None, running_keys=None):
+    with open_pdf(source) as doc:
+        return list(iter_page_lines(doc.pages(start, stop), clip, running_keys))
+
+def tracked(chunks, sizes, done, total, progress):
+    # Reports once each chunk (a page, or one worker's page range) has been
+    # consumed, so the count only moves once its lines are parsed.
+    if progress is None:
+        yield from chunks
+        return
+    for chunk, size in zip(chunks, sizes):
+        if progress(done, total) is False:
+            raise parse_cancelled(f"parse cancelled after {done} of {total} pages")
+        yield chunk
+        done += size
+    if progress(done, total) is False:
+        raise parse_cancelled(f"parse cancelled after {done} of {total} pages")
+
+def iter_parallel_lines(source, start, stop, workers, executor, clip=None, running_keys=None, progress=None):
+    chunk = -(-(stop - start) // workers)
+    starts = list(range(start, stop, chunk))
+    stops = [min(s + chunk, stop) for s in starts]
+    n = len(starts)
+    # map() hands chunks back in submission order, which keeps pages in order.
+    chunks = executor.map(page_range_lines, [source] * n, starts, stops, [clip] * n, [running_keys] * n)
+    for lines in tracked(chunks, [b - a for a, b in zip(starts, stops)], start, stop, progress):
+        yield from lines
+
+def extract(source: pdf_source, workers: Optional[int] = None, executor: Optional[Executor] = None,
+            layout: bool = False, progress: Optional[progress_hook] = None) -> parse_result:
+    parallel = bool(workers) or executor is not None
+    if parallel and not isinstance(source, (str, os.PathLike)):
+        source = read_pdf_bytes(source)
+
+    with open_pdf(source) as doc:
+        page_count = doc.page_count
+        head, first_page, clip, running_keys = [], 0, None, None
+        if layout and page_count:
+            head, first_page, clip, running_keys = layout_head(doc)
+
+        workers = min(workers or os.cpu_count() or 1, page_count - first_page)
+        if not parallel or workers < 2:
+            pages = (doc[i] for i in range(first_page, page_count))
+            pages = tracked(pages, [1] * (page_count - first_page), first_page, page_count, progress)
+            lines = iter_page_lines(pages, clip, running_keys)
+            return parse_lines(chain(head, lines))
+
+    if executor is not None:
+        lines = iter_parallel_lines(source, first_page, page_count, workers, executor, clip, running_keys, progress)
+        return parse_lines(chain(head, lines))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        lines = iter_parallel_lines(source, first_page, page_count, workers, pool, clip, running_keys, progress)
+        return parse_lines(chain(head, lines))
+
+def gradesheet_record(name: Optional[str], id: Optional[str], courses_done: courses_map,
+                      semesters_done: semesters_map) -> dict:
+    semester_of = {}
+    semesters = []
+    for semester, node in semesters_done.items():
+        if semester == "NULL":
+            continue
+        for course in node.courses:
+            semester_of[course.course] = semester
+        semesters.append({
+            "semester": semester,
+            "courses": [c.course for c in node.courses],
+            "credit": float(node.credit),
+            "gpa": float(node.gpa),
+            "cgpa": float(node.cgpa),
+        })
+
+    courses = [
+        {
+            "course": code,
+            "grade": node.grade,
+            "gpa": float(node.gpa),
+            "credit": float(node.credit),
+            "semester": semester_of.get(code),
+        }
+        for code, node in courses_done.items()
+    ]
+    return {"name": name, "id": id, "courses": courses, "semesters": semesters}
+
+def courses_from_record(record: Mapping) -> dict[str, course_node]:
+    # The inverse of gradesheet_record for the counted courses, which is all
+    # the planners look at.
+    return {
+        c["course"]: course_node(c["course"], gpa=float(c["gpa"]), grade=c.get("grade") or "",
+                                 credit=float(c.get("credit") or (4 if c["course"] == "CSE400" else 3)))
+        for c in record["courses"]
+    }
+
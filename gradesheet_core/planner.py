@@ -0,0 +1,344 @@
+import numpy as np
+from typing import Iterable, Mapping, Optional, Sequence
+from numpy.typing import ArrayLike
+from .gradebook import grade_book, to_centi, centi_ratio
+from .parser import course_node, semester_node, courses_map, semesters_map
+from .prereq_graph import graph
+from .cod_solver import cod_plans
+from .catalog import cst_st, ss_st, science_st, get_session_cod_sets
+
+def course_totals(courses_done: courses_map) -> tuple[float, float]:
+    if isinstance(courses_done, grade_book):
+        return courses_done.totals()
+    credits = sum(node.credit for node in courses_done.values())
+    points = sum(node.gpa * node.credit for node in courses_done.values())
+    return credits, points
+
+def current_cgpa(courses_done: courses_map) -> float:
+    if isinstance(courses_done, grade_book):
+        return courses_done.cgpa()
+    # Same centi-integer sums and half-up rounding as grade_book.cgpa().
+    credits = [to_centi(node.credit) for node in courses_done.values()]
+    points = sum(to_centi(node.gpa) * credit for node, credit in zip(courses_done.values(), credits))
+    return centi_ratio(points, sum(credits)) / 100
+
+def add_course(course: str, gpa_val: float, courses_done: courses_map, semesters_done: semesters_map) -> None:
+    if isinstance(courses_done, grade_book):
+        courses_done.add_course(course, gpa_val)
+        return
+
+    semester = "VIRTUAL SEMESTER"
+    credit = 4 if course == "CSE400" else 3
+
+    if course in courses_done:
+        remove_course(course, courses_done, semesters_done)
+
+    curr_node = course_node(course, gpa=gpa_val)
+    curr_node.credit = credit
+    courses_done[course] = curr_node
+
+    if semester not in semesters_done:
+        semesters_done[semester] = semester_node(semester)
+
+    semesters_done[semester].courses.append(curr_node)
+    semesters_done[semester].credit += credit
+
+    total_points = sum(c.gpa * c.credit for c in semesters_done[semester].courses)
+    total_credits = sum(c.credit for c in semesters_done[semester].courses)
+    semesters_done[semester].gpa = round(total_points / total_credits, 2) if total_credits else 0.0
+
+    total_points_all = sum(n.gpa * n.credit for n in courses_done.values())
+    total_credits_all = sum(n.credit for n in courses_done.values())
+    semesters_done[semester].cgpa = round(total_points_all / total_credits_all, 2) if total_credits_all else 0.0
+
+def remove_course(course_code: str, courses_done: courses_map, semesters_done: semesters_map) -> None:
+    if isinstance(courses_done, grade_book):
+        courses_done.remove_course(course_code)
+        return
+
+    semester = "VIRTUAL SEMESTER"
+    if course_code not in courses_done or semester not in semesters_done:
+        return
+
+    course_list = semesters_done[semester].courses
+    for i, course in enumerate(course_list):
+        if course.course == course_code:
+            removed_course = course_list.pop(i)
+            semesters_done[semester].credit -= removed_course.credit
+
+
+            total_points = sum(c.gpa * c.credit for c in course_list)
+            total_credits = sum(c.credit for c in course_list)
+            semesters_done[semester].gpa = round(total_points / total_credits, 2) if total_credits else 0.0
+
+            del courses_done[course_code]
+
+            total_points_all = sum(n.gpa * n.credit for n in courses_done.values())
+            total_credits_all = sum(n.credit for n in courses_done.values())
+            semesters_done[semester].cgpa = round(total_points_all / total_credits_all, 2) if total_credits_all else 0.0
+
+            if not semesters_done[semester].courses:
+                del semesters_done[semester]
+            return
+
+def cgpa_projection(courses_done: courses_map, target_cgpa: Optional[float] = None,
+                    total_required_credits: float = 136) -> dict:
+    earned_credits, earned_points = course_totals(courses_done)
+
+    remaining_credits = max(total_required_credits - earned_credits, 0)
+    total_credits = earned_credits + remaining_credits
+
+    max_possible_points = earned_points + (remaining_credits * 4.0)
+    max_possible_cgpa = max_possible_points / total_credits if total_credits else 0.0
+
+    rounded_max_cgpa = round(max_possible_cgpa, 2)
+    result = {"max_cgpa": rounded_max_cgpa}
+
+    if target_cgpa is not None:
+        target_cgpa = round(target_cgpa, 2)
+        required_total_points = target_cgpa * total_credits
+        needed_points = required_total_points - earned_points
+
+        if remaining_credits <= 0:
+            result["message"] = "All credits completed. Cannot improve CGPA further."
+        elif rounded_max_cgpa == target_cgpa:
+            result["required_avg_gpa"] = 4.00
+            result["message"] = (
+                f"To reach a CGPA of {target_cgpa}, you must get 4.00 GPA in all remaining courses."
+            )
+        elif rounded_max_cgpa < target_cgpa:
+            result["message"] = (
+                f"Target CGPA of {target_cgpa} is not achievable. "
+                f"Max possible CGPA is {rounded_max_cgpa}."
+            )
+        else:
+            required_avg_gpa = (needed_points / remaining_credits)
+            rounded_required_gpa = round(required_avg_gpa, 2)
+            result["required_avg_gpa"] = rounded_required_gpa
+            result["message"] = (
+                f"To reach a CGPA of {target_cgpa}, you need to average "
+                f"{rounded_required_gpa} GPA over the remaining {remaining_credits} credits."
+            )
+    return result
+
+def cgpa_planner(courses_done: courses_map, target_cgpa: Optional[float] = None, semesters: int = 0,
+                 courses_per_sem: int = 0, total_required_credits: float = 136) -> dict:
+    total_credits_done, quality_points_done = course_totals(courses_done)
+
+    remaining_credits = total_required_credits - total_credits_done
+    planned_courses = semesters * courses_per_sem
+
+    max_possible_courses = (remaining_credits + 2) // 3
+    planned_courses = min(planned_courses, max_possible_courses)
+    planned_credits = min(planned_courses * 3, remaining_credits)
+
+    total_quality_points = quality_points_done + (planned_credits * 4.0)
+    total_credits = total_credits_done + planned_credits
+
+    raw_max_cgpa = total_quality_points / total_credits if total_credits else 0.0
+    max_possible_cgpa = round(raw_max_cgpa, 2)
+    result = {"max_cgpa": max_possible_cgpa}
+
+    if target_cgpa is not None:
+        target_cgpa = round(target_cgpa, 2)
+        total_required_points = target_cgpa * total_credits
+        needed_points = total_required_points - quality_points_done
+
+        if planned_credits <= 0:
+            result["message"] = "No valid credits planned. Cannot calculate required GPA."
+        elif max_possible_cgpa == target_cgpa:
+            result["required_avg_gpa"] = 4.00
+            result["message"] = (
+                f"To reach CGPA {target_cgpa}, you must get 4.00 GPA in all planned courses."
+            )
+        elif max_possible_cgpa < target_cgpa:
+            result["required_avg_gpa"] = round(needed_points / planned_credits, 2)
+            result["message"] = (
+                f"Target CGPA of {target_cgpa} is not achievable with current plan. "
+                f"Required GPA: {result['required_avg_gpa']}."
+            )
+        else:
+            required_avg_gpa = needed_points / planned_credits
+            rounded_required_gpa = round(required_avg_gpa, 2)
+            result["required_avg_gpa"] = rounded_required_gpa
+            result["message"] = (
+                f"To reach CGPA {target_cgpa}, you must average "
+                f"{rounded_required_gpa} GPA in the next {planned_courses} courses "
+                f"({planned_credits} credits)."
+            )
+    return result
+
+def round_cents(values: ArrayLike) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 2)
+    # np.round scales by 100 before rounding, which can land a value that
+    # sits right at a half-cent on the other side of the tie from round().
+    # Only those cells are redone with round() so both paths agree exactly.
+    scaled = values * 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded = np.array(rounded)
+        rounded[ties] = [round(float(v), 2) for v in values[ties]]
+    return rounded
+
+def cgpa_projection_sweep(courses_done: courses_map, targets: ArrayLike,
+                          total_required_credits: float = 136) -> dict:
+    earned_credits, earned_points = course_totals(courses_done)
+    targets = round_cents(np.atleast_1d(targets))
+
+    remaining_credits = max(total_required_credits - earned_credits, 0)
+    total_credits = earned_credits + remaining_credits
+    max_possible_cgpa = (earned_points + remaining_credits * 4.0) / total_credits if total_credits else 0.0
+    rounded_max_cgpa = round(max_possible_cgpa, 2)
+
+    needed_points = targets * total_credits - earned_points
+    if remaining_credits > 0:
+        required = round_cents(needed_points / remaining_credits)
+        required = np.where(rounded_max_cgpa == targets, 4.00, required)
+        required = np.where(rounded_max_cgpa < targets, np.nan, required)
+    else:
+        required = np.full(targets.shape, np.nan)
+
+    return {
+        "targets": targets,
+        "max_cgpa": rounded_max_cgpa,
+        "remaining_credits": remaining_credits,
+        "required_avg_gpa": required,
+        "achievable": (remaining_credits > 0) & (rounded_max_cgpa >= targets),
+    }
+
+def cgpa_planner_sweep(courses_done: courses_map, targets: ArrayLike, semesters: ArrayLike,
+                       courses_per_sem: ArrayLike, total_required_credits: float = 136) -> dict:
+    total_credits_done, quality_points_done = course_totals(courses_done)
+    targets = round_cents(np.atleast_1d(targets))
+    semesters = np.atleast_1d(semesters)
+    courses_per_sem = np.atleast_1d(courses_per_sem)
+
+    # Axes are (target, semesters, courses_per_sem); the plan itself does not
+    # depend on the target so it is computed once over the last two axes.
+    target_axis = targets[:, None, None]
+    planned_courses = semesters[:, None] * courses_per_sem[None, :]
+
+    remaining_credits = total_required_credits - total_credits_done
+    max_possible_courses = (remaining_credits + 2) // 3
+    planned_courses = np.minimum(planned_courses, max_possible_courses)
+    planned_credits = np.minimum(planned_courses * 3, remaining_credits)
+
+    total_quality_points = quality_points_done + planned_credits * 4.0
+    total_credits = total_credits_done + planned_credits
+    raw_max_cgpa = np.divide(total_quality_points, total_credits,
+                             out=np.zeros(total_credits.shape), where=total_credits != 0)
+    max_possible_cgpa = round_cents(raw_max_cgpa)
+
+    needed_points = target_axis * total_credits - quality_points_done
+    has_plan = planned_credits > 0
+    required = round_cents(np.divide(needed_points, planned_credits,
+                                     out=np.full(needed_points.shape, np.nan), where=has_plan))
+    required = np.where(max_possible_cgpa == target_axis, 4.00, required)
+    required = np.where(has_plan, required, np.nan)
+
+    return {
+        "targets": targets,
+        "semesters": semesters,
+        "courses_per_sem": courses_per_sem,
+        "planned_courses": planned_courses,
+        "planned_credits": planned_credits,
+        "max_cgpa": max_possible_cgpa,
+        "required_avg_gpa": required,
+        "achievable": has_plan & (max_possible_cgpa >= target_axis),
+    }
+
+def cod_planner(courses_done: courses_map) -> dict:
+    comp_cod_session, arts_st_session = get_session_cod_sets(courses_done)
+
+    maximum = 5
+    cst = arts = ss = science = 0
+    taken = set()
+
+    for course in courses_done:
+        if course in cst_st:
+            cst += 1
+            taken.add(course)
+        elif course in arts_st_session:
+            arts += 1
+            taken.add(course)
+        elif course in science_st:
+            science += 1
+            taken.add(course)
+        elif course in ss_st:
+            ss += 1
+            taken.add(course)
+
+    total_taken = cst + arts + ss + science
+    remaining = maximum - total_taken
+
+    result = {
+        "total_taken": total_taken,
+        "max": maximum,
+        "cst": cst,
+        "arts": arts,
+        "ss": ss,
+        "science": science,
+        "plan": [],
+        "message": ""
+    }
+
+    if total_taken >= maximum:
+        result["message"] = "You have already completed the maximum number of CODs allowed."
+        return result
+
+    ranked = cod_plans(courses_done, arts_st_session)
+    if ranked["plans"]:
+        plan = ranked["plans"][0]["courses"]
+    else:
+        plan = []
+        result["message"] = "No combination of the remaining CODs satisfies the stream rules."
+
+    result["plan"] = plan
+    return result
+
+def simulate_retake(courses_done: courses_map, regrades: Mapping[str, float]) -> dict:
+    if isinstance(courses_done, grade_book):
+        new_cgpa = courses_done.simulate_retake(regrades)
+    else:
+        total_points = 0
+        total_credits = 0
+
+        for course, node in courses_done.items():
+            if course in regrades:
+                total_points += regrades[course] * node.credit
+            else:
+                total_points += node.gpa * node.credit
+            total_credits += node.credit
+
+        new_cgpa = round(total_points / total_credits, 2) if total_credits else 0.0
+    return {
+        "new_cgpa": new_cgpa,
+        "message": f"After retaking specified courses, your projected CGPA would be {new_cgpa}."
+    }
+
+def simulate_retake_batch(courses_done: courses_map, courses: Sequence[str], scenarios: ArrayLike) -> np.ndarray:
+    if isinstance(courses_done, grade_book):
+        return courses_done.simulate_retake_batch(courses, scenarios)
+
+    scenarios = np.asarray(scenarios, dtype=np.float64).reshape(-1, len(courses))
+    column = {course: i for i, course in enumerate(courses)}
+    total_credits = 0
+    total_points = np.zeros(len(scenarios))
+    # Summed course by course in the same order as simulate_retake, so each
+    # scenario lands on exactly the float the scalar path computes.
+    for course, node in courses_done.items():
+        i = column.get(course)
+        if i is None:
+            total_points += node.gpa * node.credit
+        else:
+            regrade = scenarios[:, i]
+            total_points += np.where(np.isnan(regrade), node.gpa, regrade) * node.credit
+        total_credits += node.credit
+    if not total_credits:
+        return np.zeros(len(scenarios))
+    return round_cents(total_points / total_credits)
+
+def get_unlocked_courses(courses_done: Iterable[str]) -> tuple[set[str], Mapping[str, tuple[str, ...]]]:
+    return graph.unlocked_frontier(courses_done), graph.unlock_map
+
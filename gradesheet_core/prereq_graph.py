@@ -0,0 +1,155 @@
+from types import MappingProxyType
+from collections import deque
+from .catalog import preq
+
+class prereq_graph:
+    __slots__ = ("codes", "index", "depth", "levels", "prereq_mask", "ancestor_mask",
+                 "descendant_mask", "gated", "dependents", "unlock_map", "prereq_map")
+
+    def __init__(self, unlocks_by):
+        seen = dict.fromkeys(unlocks_by)
+        for unlocks in unlocks_by.values():
+            seen.update(dict.fromkeys(unlocks))
+        prereqs = {code: [] for code in seen}
+        for course, unlocks in unlocks_by.items():
+            for unlocked in unlocks:
+                prereqs[unlocked].append(course)
+
+        # Kahn's algorithm over the catalogue order. Courses are then numbered
+        # in topological order, so every bitset decodes prerequisites-first.
+        pending = {code: len(p) for code, p in prereqs.items()}
+        ready = deque(code for code in seen if not pending[code])
+        order = []
+        while ready:
+            code = ready.popleft()
+            order.append(code)
+            for unlocked in unlocks_by.get(code, ()):
+                pending[unlocked] -= 1
+                if not pending[unlocked]:
+                    ready.append(unlocked)
+        if len(order) != len(seen):
+            cycle = sorted(code for code, n in pending.items() if n)
+            raise ValueError(f"prerequisite cycle through {', '.join(cycle)}")
+
+        index = {code: i for i, code in enumerate(order)}
+        depth = [0] * len(order)
+        prereq_mask = [0] * len(order)
+        ancestor_mask = [0] * len(order)
+        for i, code in enumerate(order):
+            for p in prereqs[code]:
+                j = index[p]
+                prereq_mask[i] |= 1 << j
+                ancestor_mask[i] |= (1 << j) | ancestor_mask[j]
+                depth[i] = max(depth[i], depth[j] + 1)
+
+        descendant_mask = [0] * len(order)
+        for i in reversed(range(len(order))):
+            for unlocked in unlocks_by.get(order[i], ()):
+                j = index[unlocked]
+                descendant_mask[i] |= (1 << j) | descendant_mask[j]
+
+        levels = {}
+        for i, code in enumerate(order):
+            levels.setdefault(depth[i], []).append(code)
+
+        self.codes = tuple(order)
+        self.index = MappingProxyType(index)
+        self.depth = tuple(depth)
+        self.levels = tuple(tuple(levels[d]) for d in sorted(levels))
+        self.prereq_mask = tuple(prereq_mask)
+        self.ancestor_mask = tuple(ancestor_mask)
+        self.descendant_mask = tuple(descendant_mask)
+        # Only courses with at least one prerequisite can become "unlocked".
+        self.gated = tuple(i for i, mask in enumerate(prereq_mask) if mask)
+        self.dependents = tuple(tuple(index[u] for u in unlocks_by.get(code, ())) for code in order)
+        self.unlock_map = MappingProxyType(
+            {code: tuple(unlocks) for code, unlocks in unlocks_by.items() if unlocks})
+        self.prereq_map = MappingProxyType(
+            {code: tuple(p) for code, p in prereqs.items() if p})
+
+    def mask(self, courses):
+        index = self.index
+        mask = 0
+        for code in courses:
+            i = index.get(code)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def codes_of(self, mask):
+        codes = []
+        while mask:
+            low = mask & -mask
+            codes.append(self.codes[low.bit_length() - 1])
+            mask ^= low
+        return codes
+
+    def transitive_unlocks(self, code):
+        i = self.index.get(code)
+        return self.codes_of(self.descendant_mask[i]) if i is not None else []
+
+    def transitive_prereqs(self, code):
+        i = self.index.get(code)
+        return self.codes_of(self.ancestor_mask[i]) if i is not None else []
+
+    def blocking(self, code, courses_done=()):
+        i = self.index.get(code)
+        if i is None:
+            return []
+        return self.codes_of(self.ancestor_mask[i] & ~self.mask(courses_done))
+
+    def is_unlocked(self, code, courses_done=()):
+        i = self.index.get(code)
+        return i is not None and not self.prereq_mask[i] & ~self.mask(courses_done)
+
+    def unlocked_frontier(self, courses_done):
+        done = self.mask(courses_done)
+        return {
+            self.codes[i] for i in self.gated
+            if not (done >> i) & 1 and not self.prereq_mask[i] & ~done
+        }
+
+graph = prereq_graph(preq)
+
+class frontier_tracker:
+    def __init__(self, courses_done=(), index=graph):
+        self.graph = index
+        self.done = index.mask(courses_done)
+        self.courses = index.unlocked_frontier(courses_done)
+
+    def add(self, code):
+        g = self.graph
+        i = g.index.get(code)
+        if i is None or (self.done >> i) & 1:
+            return
+        self.done |= 1 << i
+        self.courses.discard(code)
+        for j in g.dependents[i]:
+            if not (self.done >> j) & 1 and not g.prereq_mask[j] & ~self.done:
+                self.courses.add(g.codes[j])
+
+    def remove(self, code):
+        g = self.graph
+        i = g.index.get(code)
+        if i is None or not (self.done >> i) & 1:
+            return
+        self.done &= ~(1 << i)
+        if g.prereq_mask[i] and not g.prereq_mask[i] & ~self.done:
+            self.courses.add(code)
+        for j in g.dependents[i]:
+            self.courses.discard(g.codes[j])
+
+    def touch(self, code, courses_done):
+        if code in courses_done:
+            self.add(code)
+        else:
+            self.remove(code)
+
+    def __contains__(self, code):
+        return code in self.courses
+
+    def __iter__(self):
+        return iter(self.courses)
+
+    def __len__(self):
+        return len(self.courses)
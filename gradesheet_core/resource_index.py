@@ -0,0 +1,167 @@
+import os
+import sys
+import json
+import argparse
+import threading
+from typing import Optional
+from types import MappingProxyType
+from .catalog import get_all_course_codes
+
+RESOURCE_DIR = "resources"
+ARTIFACT_VERSION = 1
+DEFAULT_ARTIFACT = os.environ.get("GRADESHEET_RESOURCE_INDEX", "resource_index.json")
+
+def resource_filename(code):
+    return code.replace("/", "_") + ".json"
+
+def has_content(data):
+    questions = data.get("previous_questions") or {}
+    return bool(data.get("resources") or questions.get("mid") or questions.get("final"))
+
+def source_stamps(resource_dir):
+    stamps = {}
+    for entry in os.scandir(resource_dir):
+        if entry.name.endswith(".json") and entry.is_file():
+            stat = entry.stat()
+            stamps[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+class resource_index:
+    def __init__(self, files, stamps=None):
+        # files maps a resource filename to its parsed contents.
+        known = set(get_all_course_codes())
+        by_file = {resource_filename(code): code for code in known}
+        entries = {}
+        for filename, data in files.items():
+            entries[by_file.get(filename, filename[:-len(".json")])] = data
+        self.files = MappingProxyType(dict(files))
+        self.stamps = stamps or {}
+        self.entries = MappingProxyType(entries)
+        self.courses_with_resources = tuple(sorted(
+            code for code, data in entries.items() if code in known and data and has_content(data)
+        ))
+
+    def with_file(self, filename, data, stamp=None):
+        # Copy-on-write: build a new index around one changed file and leave
+        # this one untouched for anyone still holding it.
+        files = dict(self.files)
+        stamps = dict(self.stamps)
+        if data is None:
+            files.pop(filename, None)
+            stamps.pop(filename, None)
+        else:
+            files[filename] = data
+            if stamp is not None:
+                stamps[filename] = stamp
+        return resource_index(files, stamps)
+
+    def get(self, code):
+        return self.entries.get(code)
+
+    def __contains__(self, code):
+        return code in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+def read_resource(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def load_course_resources(course_code: str, resource_dir: str = RESOURCE_DIR) -> Optional[dict]:
+    # Reads one file straight from disk, bypassing the shared index.
+    return read_resource(os.path.join(resource_dir, resource_filename(course_code)))
+
+def compile_resources(resource_dir=RESOURCE_DIR):
+    stamps = source_stamps(resource_dir)
+    files = {name: read_resource(os.path.join(resource_dir, name)) for name in sorted(stamps)}
+    return resource_index({name: data for name, data in files.items() if data is not None}, stamps)
+
+def write_artifact(index, path=DEFAULT_ARTIFACT):
+    payload = {"version": ARTIFACT_VERSION, "stamps": index.stamps, "files": dict(index.files)}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def load_artifact(resource_dir=RESOURCE_DIR, path=DEFAULT_ARTIFACT):
+    # Only trusted while every source file still has the size and mtime it
+    # was built from; checking that is a directory scan, not a re-parse.
+    payload = read_resource(path) if path and os.path.exists(path) else None
+    if not payload or payload.get("version") != ARTIFACT_VERSION:
+        return None
+    if payload.get("stamps") != source_stamps(resource_dir):
+        return None
+    return resource_index(payload["files"], payload["stamps"])
+
+_indexes = {}
+_lock = threading.Lock()
+
+def get_index(resource_dir: str = RESOURCE_DIR) -> resource_index:
+    index = _indexes.get(resource_dir)
+    if index is None:
+        with _lock:
+            index = _indexes.get(resource_dir)
+            if index is None:
+                index = load_artifact(resource_dir) or compile_resources(resource_dir)
+                _indexes[resource_dir] = index
+    return index
+
+def reload_file(resource_dir, filename):
+    path = os.path.join(resource_dir, filename)
+    if os.path.exists(path):
+        data = read_resource(path)
+        if data is None:
+            # Most likely caught mid-write; the event for the finished write
+            # will bring it in, so keep serving the previous version.
+            return
+        stat = os.stat(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+    else:
+        data, stamp = None, None
+
+    with _lock:
+        current = _indexes.get(resource_dir) or compile_resources(resource_dir)
+        if data is None and filename not in current.files:
+            return
+        _indexes[resource_dir] = current.with_file(filename, data, stamp)
+
+class resource_watcher:
+    def __init__(self, resource_dir):
+        self.resource_dir = resource_dir
+
+    def dispatch(self, event):
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        for path in paths:
+            name = os.path.basename(os.fsdecode(path)) if path else ""
+            if name.endswith(".json") and os.path.dirname(os.path.abspath(os.fsdecode(path))) == os.path.abspath(self.resource_dir):
+                reload_file(self.resource_dir, name)
+
+def watch_resources(resource_dir: str = RESOURCE_DIR):
+    from watchdog.observers import Observer
+
+    get_index(resource_dir)
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(resource_watcher(resource_dir), resource_dir, recursive=False)
+    observer.start()
+    return observer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the course resource directory into one index file.")
+    parser.add_argument("resource_dir", nargs="?", default=RESOURCE_DIR)
+    parser.add_argument("-o", "--output", default=DEFAULT_ARTIFACT)
+    args = parser.parse_args(argv)
+
+    index = compile_resources(args.resource_dir)
+    write_artifact(index, args.output)
+    print(f"{len(index)} resource files, {len(index.courses_with_resources)} with resources -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+from typing import Optional
+from functools import lru_cache
+from itertools import combinations
+from .prereq_graph import graph
+from .catalog import core, cs_elective, get_session_cod_sets
+from .parser import courses_map
+from .planner import course_totals, cod_planner
+
+def course_credit(code):
+    return 4.0 if code == "CSE400" else 3.0
+
+def graduation_requirements(courses_done: courses_map, dept: str = "CSE",
+                            total_required_credits: Optional[float] = None) -> dict:
+    if total_required_credits is None:
+        total_required_credits = 136 if dept == "CSE" else 124
+    core_set = core if dept == "CSE" else core - cs_elective
+    comp_cod_session, _ = get_session_cod_sets(courses_done)
+    done = set(courses_done)
+
+    named = (core_set | comp_cod_session | {"CSE400"}) - done
+    cods = [c for c in cod_planner(courses_done)["plan"] if c not in done]
+    courses = set(named) | set(cods)
+    # A required course can sit behind one that is not itself required
+    # (e.g. CS students still need CSE260 before CSE340), so pull those in.
+    for code in list(courses):
+        courses.update(graph.blocking(code, done))
+
+    earned_credits, _ = course_totals(courses_done)
+    planned = earned_credits + sum(course_credit(c) for c in courses)
+    pool = [c for c in graph.codes
+            if c.startswith("CSE") and c not in core_set and c != "CSE400" and c not in done]
+    electives = []
+    while planned < total_required_credits:
+        # Cheapest elective first: fewest extra prerequisites, then no dependents.
+        candidates = [c for c in pool if c not in courses]
+        if not candidates:
+            break
+        pick = min(candidates, key=lambda c: (len(set(graph.blocking(c, done)) - courses),
+                                              len(graph.unlock_map.get(c, ())), c))
+        extra = [pick] + [c for c in graph.blocking(pick, done) if c not in courses]
+        electives.append(pick)
+        courses.update(extra)
+        planned += sum(course_credit(c) for c in extra)
+
+    return {
+        "courses": sorted(courses),
+        "cod": sorted(cods),
+        "electives": sorted(electives),
+        "earned_credits": earned_credits,
+        "planned_credits": planned,
+        "total_required": total_required_credits,
+    }
+
+def bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+@lru_cache(maxsize=65536)
+def chain_heights(mask):
+    # Longest chain (in semesters) from each pending course to the end of the
+    # plan, counting the course itself; indices are topological so one reverse
+    # pass is enough.
+    heights = {}
+    for i in sorted(bits(mask), reverse=True):
+        heights[i] = 1 + max((heights[j] for j in graph.dependents[i] if j in heights), default=0)
+    return heights
+
+@lru_cache(maxsize=65536)
+def lower_bound(mask, free, cap):
+    heights = chain_heights(mask)
+    total = len(heights) + free
+    bound = -(-total // cap)
+    by_height = sorted(heights.values(), reverse=True)
+    # Courses with height >= h all have to finish before the last h - 1 semesters.
+    for n, h in enumerate(by_height, 1):
+        bound = max(bound, -(-n // cap) + h - 1)
+    return bound
+
+def semester_choices(mask, cap, max_credits):
+    heights = chain_heights(mask)
+    ready = [i for i in bits(mask) if not graph.prereq_mask[i] & mask]
+    ready.sort(key=lambda i: (-heights[i], -(graph.descendant_mask[i] & mask).bit_count(), i))
+    for size in range(min(len(ready), cap), 0, -1):
+        found = False
+        for combo in combinations(ready, size):
+            if max_credits is None or sum(course_credit(graph.codes[i]) for i in combo) <= max_credits:
+                found = True
+                yield combo
+        if found:
+            return
+
+def free_room(combo, cap, max_credits):
+    room = cap - len(combo)
+    if max_credits is not None:
+        used = sum(course_credit(graph.codes[i]) for i in combo)
+        room = min(room, int((max_credits - used) // 3))
+    return max(room, 0)
+
+@lru_cache(maxsize=4096)
+def solve(mask, free, cap, max_credits, node_budget):
+    free_cap = cap if max_credits is None else min(cap, int(max_credits // 3))
+
+    def greedy(mask, free):
+        plan = []
+        while mask:
+            combo = next(semester_choices(mask, cap, max_credits))
+            take = min(free, free_room(combo, cap, max_credits))
+            plan.append((combo, take))
+            mask &= ~sum(1 << i for i in combo)
+            free -= take
+        while free:
+            take = min(free, free_cap)
+            plan.append(((), take))
+            free -= take
+        return plan
+
+    best = greedy(mask, free)
+    bound = lower_bound(mask, free, free_cap) if mask or free else 0
+    if len(best) <= bound:
+        return tuple(best), bound, True
+
+    nodes = 0
+    failed = {}
+
+    def search(mask, free, slots):
+        nonlocal nodes
+        if not mask:
+            return greedy(0, free) if -(-free // free_cap) <= slots else None
+        if lower_bound(mask, free, free_cap) > slots or failed.get((mask, free), -1) >= slots:
+            return None
+        for combo in semester_choices(mask, cap, max_credits):
+            nodes += 1
+            if nodes > node_budget:
+                raise TimeoutError
+            take = min(free, free_room(combo, cap, max_credits))
+            rest = search(mask & ~sum(1 << i for i in combo), free - take, slots - 1)
+            if rest is not None:
+                return [(combo, take)] + rest
+        failed[(mask, free)] = slots
+        return None
+
+    # Iterative deepening from the lower bound: the first length that admits a
+    # schedule is optimal. Running out of budget keeps the greedy plan.
+    try:
+        for slots in range(bound, len(best)):
+            plan = search(mask, free, slots)
+            if plan is not None:
+                return tuple(plan), bound, True
+    except TimeoutError:
+        return tuple(best), bound, False
+    return tuple(best), bound, True
+
+def schedule_graduation(courses_done: courses_map, dept: str = "CSE", max_courses: int = 4,
+                        max_credits: Optional[float] = None, total_required_credits: Optional[float] = None,
+                        node_budget: int = 20000) -> dict:
+    if max_courses < 1 or (max_credits is not None and max_credits < 4):
+        raise ValueError("a semester must fit at least one course of every size")
+    req = graduation_requirements(courses_done, dept, total_required_credits)
+    courses = req["courses"]
+    in_graph = graph.mask(courses)
+
+    # Courses with no pending prerequisite and nothing pending behind them can
+    # go in any semester, so the search only tracks how many of them are left.
+    chain = 0
+    for i in bits(in_graph):
+        if graph.prereq_mask[i] & in_graph or graph.descendant_mask[i] & in_graph or course_credit(graph.codes[i]) != 3.0:
+            chain |= 1 << i
+    chain_codes = set(graph.codes_of(chain))
+    free_codes = [c for c in req["cod"] + req["electives"] if c not in chain_codes]
+    free_codes += sorted(c for c in courses if c not in chain_codes and c not in free_codes)
+
+    plan, bound, optimal = solve(chain, len(free_codes), max_courses, max_credits, node_budget)
+
+    semesters = []
+    pending_free = iter(free_codes)
+    for combo, take in plan:
+        names = [graph.codes[i] for i in combo] + [next(pending_free) for _ in range(take)]
+        semesters.append({"courses": names, "credits": sum(course_credit(c) for c in names)})
+
+    if not semesters:
+        message = "All graduation requirements are already met."
+    else:
+        limit = f"{max_courses} courses" + (f" / {max_credits:g} credits" if max_credits is not None else "")
+        message = (f"You can graduate in {len(semesters)} more semester{'s' if len(semesters) != 1 else ''} "
+                   f"taking at most {limit} per semester.")
+    return {
+        "semesters": semesters,
+        "count": len(semesters),
+        "lower_bound": bound,
+        "optimal": optimal,
+        "requirements": req,
+        "message": message,
+    }
@@ -0,0 +1,275 @@
+import sys
+import json
+import math
+import logging
+import argparse
+from collections import deque
+from datetime import timedelta
+import numpy as np
+import tornado.web
+import tornado.locks
+import tornado.ioloop
+from tornado.util import TimeoutError as QueueTimeout
+from gradesheet_core.catalog import grade_points
+from gradesheet_core.parser import gradesheet_record, courses_from_record
+from gradesheet_core.guard import parse_guard, parse_limit_error, default_guard
+from gradesheet_core.planner import cgpa_projection, cgpa_planner, cod_planner, simulate_retake, get_unlocked_courses
+
+log = logging.getLogger("server")
+
+PERCENTILES = (50, 90, 95, 99)
+LIMIT_STATUS = {"size": 413, "pages": 413, "busy": 503}
+# Far above any degree; keeps credit * gpa sums finite so replies stay valid JSON.
+MAX_CREDITS = 1000
+
+def parse_pdf(data, layout=False, guard=default_guard):
+    # The guard runs extract in a sandboxed worker process; this thread only waits.
+    name, id, courses_done, semesters_done = guard.extract(data, layout)
+    return gradesheet_record(name, id, courses_done, semesters_done)
+
+def to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class latency_stats:
+    def __init__(self, window=4096):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.errors = {}
+        self.in_flight = 0
+
+    def record(self, route, seconds, status):
+        self.samples.setdefault(route, deque(maxlen=self.window)).append(seconds)
+        self.counts[route] = self.counts.get(route, 0) + 1
+        if status >= 500:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self):
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            ms = np.percentile(np.fromiter(samples, dtype=np.float64), PERCENTILES) * 1000
+            routes[route] = {
+                "requests": self.counts[route],
+                "errors": self.errors.get(route, 0),
+                "window": len(samples),
+                **{f"p{p}_ms": round(float(v), 2) for p, v in zip(PERCENTILES, ms)},
+                "max_ms": round(max(samples) * 1000, 2),
+            }
+        return {"in_flight": self.in_flight, "routes": routes}
+
+class api_handler(tornado.web.RequestHandler):
+    route = None
+
+    def initialize(self):
+        self.holding = False
+        self.retry_after = None
+
+    async def prepare(self):
+        # Every API call holds one slot for its whole lifetime; callers wait
+        # up to queue_timeout for one and get a 503 after that.
+        try:
+            await self.settings["slots"].acquire(timeout=timedelta(seconds=self.settings["queue_timeout"]))
+        except QueueTimeout:
+            self.retry_after = 1
+            raise tornado.web.HTTPError(503, reason="Server busy")
+        self.holding = True
+        self.settings["metrics"].in_flight += 1
+
+    def on_finish(self):
+        if self.holding:
+            self.holding = False
+            self.settings["metrics"].in_flight -= 1
+            self.settings["slots"].release()
+        self.settings["metrics"].record(self.route, self.request.request_time(), self.get_status())
+
+    def write_json(self, payload):
+        self.set_header("Content-Type", "application/json")
+        self.finish(json.dumps(payload, default=to_json, allow_nan=False))
+
+    def write_error(self, status_code, **kwargs):
+        if self.retry_after is not None:
+            self.set_header("Retry-After", str(self.retry_after))
+        message = self._reason
+        if "exc_info" in kwargs and not isinstance(kwargs["exc_info"][1], tornado.web.HTTPError):
+            message = "Internal server error"
+        self.write_json({"error": message})
+
+    def body_json(self):
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            raise tornado.web.HTTPError(400, reason="Request body must be JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Request body must be a JSON object")
+        return body
+
+    def courses_done(self, body):
+        try:
+            courses = courses_from_record(body)
+            # courses_from_record fills in a missing or zero credit, so a
+            # zero sent explicitly is caught on the raw record.
+            if not all(c.get("credit") is None or float(c["credit"]) > 0 for c in body["courses"]) \
+                    or not all(isinstance(code, str) and 0 <= c.gpa <= 4 and 0 < c.credit <= MAX_CREDITS
+                               for code, c in courses.items()):
+                raise ValueError("course code, gpa or credit out of range")
+            return courses
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise tornado.web.HTTPError(400, reason="'courses' must be a list of {course, gpa[, credit, grade]}")
+
+    def number(self, body, key, default=None, cast=float, valid=None, rule="a finite number"):
+        if key not in body or body[key] is None:
+            return default
+        try:
+            value = body[key]
+            if isinstance(value, bool):
+                raise TypeError(value)
+            value = cast(value)
+            if not math.isfinite(value) or (valid is not None and not valid(value)):
+                raise ValueError(value)
+            return value
+        except (TypeError, ValueError, OverflowError):
+            raise tornado.web.HTTPError(400, reason=f"'{key}' must be {rule}")
+
+    def target_cgpa(self, body):
+        return self.number(body, "target_cgpa", valid=lambda v: 0 <= v <= 4, rule="a number from 0 to 4")
+
+    def required_credits(self, body):
+        return self.number(body, "total_required_credits", 136, valid=lambda v: 0 < v <= MAX_CREDITS,
+                           rule=f"a number above 0 and at most {MAX_CREDITS}")
+
+class parse_handler(api_handler):
+    route = "parse"
+
+    async def post(self):
+        upload = self.request.files.get("file")
+        data = upload[0]["body"] if upload else self.request.body
+        if not data:
+            raise tornado.web.HTTPError(400, reason="Send the PDF as the request body or a 'file' form field")
+        layout = self.get_argument("layout", "0") not in ("0", "false", "")
+        loop = tornado.ioloop.IOLoop.current()
+        try:
+            record = await loop.run_in_executor(None, parse_pdf, data, layout, self.settings["parse_guard"])
+        except parse_limit_error as e:
+            if e.limit == "busy":
+                self.retry_after = 1
+            raise tornado.web.HTTPError(LIMIT_STATUS.get(e.limit, 422), reason=str(e))
+        except Exception as e:
+            log.warning("parse failed: %s", e)
+            raise tornado.web.HTTPError(422, reason="Could not parse the uploaded gradesheet")
+        self.write_json(record)
+
+class projection_handler(api_handler):
+    route = "projection"
+
+    def post(self):
+        body = self.body_json()
+        self.write_json(cgpa_projection(
+            self.courses_done(body),
+            self.target_cgpa(body),
+            self.required_credits(body),
+        ))
+
+class planner_handler(api_handler):
+    route = "planner"
+
+    def post(self):
+        body = self.body_json()
+        self.write_json(cgpa_planner(
+            self.courses_done(body),
+            self.target_cgpa(body),
+            self.number(body, "semesters", 0, int, valid=lambda v: v > 0, rule="a whole number above 0"),
+            self.number(body, "courses_per_sem", 0, int, valid=lambda v: v > 0, rule="a whole number above 0"),
+            self.required_credits(body),
+        ))
+
+class cod_handler(api_handler):
+    route = "cod"
+
+    def post(self):
+        self.write_json(cod_planner(self.courses_done(self.body_json())))
+
+class retake_handler(api_handler):
+    route = "retake"
+
+    def post(self):
+        body = self.body_json()
+        courses_done = self.courses_done(body)
+        regrades = {}
+        if not isinstance(body.get("regrades") or {}, dict):
+            raise tornado.web.HTTPError(400, reason="'regrades' must map course codes to grades")
+        for code, value in (body.get("regrades") or {}).items():
+            # Accept either a grade point or a letter grade per course.
+            gpa = grade_points.get(value) if isinstance(value, str) else value
+            if code not in courses_done or isinstance(gpa, bool) or not isinstance(gpa, (int, float)) \
+                    or not 0 <= gpa <= 4:
+                raise tornado.web.HTTPError(400, reason=f"Bad regrade for {code!r}")
+            regrades[code] = float(gpa)
+        self.write_json(simulate_retake(courses_done, regrades))
+
+class unlocked_handler(api_handler):
+    route = "unlocked"
+
+    def post(self):
+        unlocked, unlock_map = get_unlocked_courses(self.courses_done(self.body_json()))
+        self.write_json({
+            "unlocked": sorted(unlocked),
+            "unlocks": {code: list(unlock_map.get(code, ())) for code in sorted(unlocked)},
+        })
+
+class metrics_handler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "application/json")
+        self.finish(json.dumps(self.settings["metrics"].summary()))
+
+def make_app(guard=default_guard, max_concurrency=32, queue_timeout=5.0):
+    return tornado.web.Application(
+        [
+            (r"/parse", parse_handler),
+            (r"/projection", projection_handler),
+            (r"/planner", planner_handler),
+            (r"/cod", cod_handler),
+            (r"/retake", retake_handler),
+            (r"/unlocked", unlocked_handler),
+            (r"/metrics", metrics_handler),
+        ],
+        parse_guard=guard,
+        slots=tornado.locks.Semaphore(max_concurrency),
+        queue_timeout=queue_timeout,
+        metrics=latency_stats(),
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON API for the gradesheet parser and planners.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("-j", "--max-parses", type=int, help="PDFs parsed at once; more get a 503 (default: all cores)")
+    parser.add_argument("--max-pages", type=int, default=40, help="reject PDFs with more pages")
+    parser.add_argument("--parse-timeout", type=float, default=20.0, help="seconds before a parse is killed")
+    parser.add_argument("--parse-memory-mb", type=float, default=512, help="address-space cap for a parse")
+    parser.add_argument("--parse-wait", type=float, default=1.0, help="seconds to wait for a parse slot before a 503")
+    parser.add_argument("-c", "--max-concurrency", type=int, default=32, help="requests handled at once")
+    parser.add_argument("--queue-timeout", type=float, default=5.0, help="seconds a request may wait for a slot")
+    parser.add_argument("--max-body-mb", type=float, default=10, help="largest accepted upload")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    guard = parse_guard(args.max_parses, args.max_pages, args.parse_timeout, args.parse_memory_mb,
+                        args.max_body_mb, args.parse_wait)
+    guard.warm()
+    app = make_app(guard, args.max_concurrency, args.queue_timeout)
+    app.listen(args.port, args.host, max_body_size=int(args.max_body_mb * 1024 * 1024))
+    log.info("listening on http://%s:%d", args.host, args.port)
+    try:
+        tornado.ioloop.IOLoop.current().start()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
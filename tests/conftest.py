@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app modules live at the repository root and the synthetic PDF
+# generator in benchmarks/; neither is an installed package.
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
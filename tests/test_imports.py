@@ -0,0 +1,40 @@
+import os
+import sys
+import subprocess
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE = "gradesheet_core.parser, gradesheet_core.planner"
+APP = ("streamlit, gradesheet_core.parse_jobs, gradesheet_core.forecast, gradesheet_core.scheduler, "
+       "gradesheet_core.cod_solver, gradesheet_core.resource_index, views")
+
+def import_profile(statement):
+    # A fresh interpreter per run so nothing is already in sys.modules.
+    code = f"import sys; import {statement}; print(','.join(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total_us, name = line.split(":", 1)[1].split("|")
+        # Nested imports are indented under their parent; only the top level
+        # adds up to the wall time of the statement.
+        if not name[1:].startswith(" "):
+            cumulative[name.strip()] = int(total_us)
+    return sum(cumulative.values()) / 1000, set(proc.stdout.strip().split(","))
+
+# Streamlit itself imports the base plotly package for its chart element, so
+# the app set only rules out plotly.express.
+@pytest.mark.parametrize("statement, forbidden, budget_ms", [
+    (CORE, ("streamlit", "plotly", "pandas", "fitz", "pymupdf"), 250),
+    (APP, ("plotly.express", "pandas", "fitz", "pymupdf"), 1000),
+], ids=["core", "app"])
+def test_cold_import_stays_light(statement, forbidden, budget_ms):
+    runs = [import_profile(statement) for _ in range(3)]
+    modules = runs[-1][1]
+    assert [m for m in forbidden if m in modules] == []
+    assert min(ms for ms, _ in runs) <= budget_ms
@@ -0,0 +1,20 @@
+import pytest
+from gradesheet_core.parser import parse_lines, extract, gradesheet_record
+from bench_extract import synthetic_gradesheet
+
+def courses(lines):
+    _, _, book, _ = parse_lines(lines)
+    return {code: (c.grade, c.gpa, c.credit) for code, c in book.items()}
+
+def test_gradeless_row_does_not_take_the_next_grade():
+    # CSE110 never gets a grade, so CSE111's grade must not be credited to it.
+    got = courses(["SEMESTER:", "FALL 2020", "CSE110", "Programming", "3.00",
+                   "CSE111", "Prog II", "3.00", "A", "4.00", "CGPA", "4.00"])
+    assert got == {"CSE111": ("A", 4.0, 3.0)}
+
+@pytest.mark.parametrize("pages", [1, 2, 3, 6])
+def test_layout_mode_matches_plain_extraction(pages):
+    # Table rows repeat at the same height from page to page; layout mode must
+    # not mistake them for the banner or footer.
+    data = synthetic_gradesheet(pages)
+    assert gradesheet_record(*extract(data, layout=True)) == gradesheet_record(*extract(data))
@@ -0,0 +1,12 @@
+from gradesheet_core.gradebook import grade_book
+from gradesheet_core.parser import course_node
+from gradesheet_core.planner import current_cgpa
+
+def test_current_cgpa_rounds_half_up_like_the_book():
+    courses = {"CSE110": course_node("CSE110", 2.3, "C+", 3), "MAT110": course_node("MAT110", 2.31, "C+", 3)}
+    book = grade_book()
+    for code, node in courses.items():
+        book.count(code, book.append(code, node.grade, node.gpa, node.credit))
+    assert current_cgpa(book) == 2.31
+    assert current_cgpa(courses) == 2.31
+    assert current_cgpa({}) == 0.0
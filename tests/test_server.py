@@ -0,0 +1,50 @@
+import json
+import asyncio
+import pytest
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_sockets
+from server import make_app
+
+COURSES = [{"course": "CSE110", "gpa": 3.0}, {"course": "MAT110", "gpa": 4.0}]
+
+def post(route, body):
+    async def fetch():
+        sockets = bind_sockets(0, "127.0.0.1")
+        server = HTTPServer(make_app())
+        server.add_sockets(sockets)
+        try:
+            response = await AsyncHTTPClient().fetch(f"http://127.0.0.1:{sockets[0].getsockname()[1]}/{route}",
+                                                     method="POST", body=json.dumps(body))
+        except HTTPClientError as e:
+            response = e.response
+        finally:
+            server.stop()
+        return response.code, json.loads(response.body)
+    return asyncio.run(fetch())
+
+@pytest.mark.parametrize("route, body", [
+    ("projection", {"courses": [{"course": "CSE110", "gpa": 1e308}]}),
+    ("projection", {"courses": [{"course": "CSE110", "gpa": 4.5}]}),
+    ("projection", {"courses": [{"course": "CSE110", "gpa": -1}]}),
+    ("projection", {"courses": [{"course": "CSE110", "gpa": 3.0, "credit": 0}]}),
+    ("projection", {"courses": [{"course": "CSE110", "gpa": 3.0, "credit": -3}]}),
+    ("projection", {"courses": [{"course": "CSE110", "gpa": 3.0, "credit": 1e308}]}),
+    ("projection", {"courses": [{"course": 110, "gpa": 3.0}]}),
+    ("projection", {"courses": COURSES, "target_cgpa": 4.5}),
+    ("projection", {"courses": COURSES, "target_cgpa": -0.5}),
+    ("projection", {"courses": COURSES, "total_required_credits": 0}),
+    ("projection", {"courses": COURSES, "total_required_credits": 1e308}),
+    ("planner", {"courses": COURSES, "target_cgpa": 3.5, "semesters": 0, "courses_per_sem": 4}),
+    ("planner", {"courses": COURSES, "target_cgpa": 3.5, "semesters": 2, "courses_per_sem": -4}),
+    ("retake", {"courses": COURSES, "regrades": {"CSE110": 1e308}}),
+])
+def test_out_of_range_input_is_a_400(route, body):
+    code, reply = post(route, body)
+    assert code == 400, reply
+    assert "error" in reply
+
+def test_in_range_input_is_answered():
+    code, reply = post("planner", {"courses": COURSES, "target_cgpa": 3.5, "semesters": 2, "courses_per_sem": 4})
+    assert code == 200
+    assert reply["max_cgpa"] == 3.9
@@ -0,0 +1,112 @@
+import hashlib
+import streamlit as st
+from gradesheet_core.gradebook import grade_book, VIRTUAL_SEMESTER
+from gradesheet_core.catalog import (
+    core, cs_elective, cst_st, ss_st, science_st, get_all_course_codes, get_session_cod_sets
+)
+
+def fingerprint(courses_done, dept, semesters_done=None):
+    if isinstance(courses_done, grade_book):
+        # The book's digest already covers its semester rows and table.
+        return f"{dept}:{courses_done.fingerprint()}"
+    h = hashlib.blake2b(digest_size=16)
+    for code, node in courses_done.items():
+        h.update(f"{code}\0{node.grade}\0{node.gpa}\0{node.credit}\n".encode())
+    h.update(b"\1")
+    for name, node in (semesters_done or {}).items():
+        h.update(f"{name}\0{node.credit}\0{node.gpa}\0{node.cgpa}\n".encode())
+        for course in node.courses:
+            h.update(f"{course.course}\0{course.grade}\0{course.gpa}\0{course.credit}\n".encode())
+    return f"{dept}:{h.hexdigest()}"
+
+# Every cached view takes the fingerprint as its only hashed argument; the
+# objects it was computed from are passed underscore-prefixed so Streamlit
+# skips hashing them.
+
+@st.cache_data
+def catalog_codes():
+    return get_all_course_codes()
+
+@st.cache_data(max_entries=256)
+def cod_sets(fp, _courses_done):
+    return get_session_cod_sets(_courses_done)
+
+@st.cache_data(max_entries=256)
+def course_options(fp, added, retaken, _courses_done):
+    eligible_to_add = [
+        code for code in catalog_codes()
+        if code not in _courses_done and code not in added
+    ]
+    retake_options = [
+        code for code, node in _courses_done.items()
+        if node.gpa < 4.0 and code not in retaken
+    ]
+    return eligible_to_add, retake_options
+
+@st.cache_data(max_entries=256)
+def completed_breakdown(fp, dept, _courses_done):
+    import pandas as pd
+
+    comp_cod_session, arts_st_session = cod_sets(fp, _courses_done)
+    core_set = core if dept == "CSE" else core - cs_elective
+
+    core_data, comp_cod_data, elective_data, cod_data = [], [], [], []
+    for code in sorted(_courses_done.keys()):
+        if code in core_set:
+            core_data.append({"Course Code": code})
+        elif code in comp_cod_session:
+            comp_cod_data.append({"Course Code": code})
+        elif code.startswith("CSE") and code not in core_set and code not in comp_cod_session:
+            elective_data.append({"Course Code": code})
+        elif code in cst_st:
+            cod_data.append({"Course Code": code, "Stream": "CST"})
+        elif code in arts_st_session:
+            cod_data.append({"Course Code": code, "Stream": "Arts"})
+        elif code in ss_st:
+            cod_data.append({"Course Code": code, "Stream": "Social Sciences"})
+        elif code in science_st:
+            cod_data.append({"Course Code": code, "Stream": "Science"})
+
+    frames = {}
+    for label, rows in (("core", core_data), ("comp_cod", comp_cod_data), ("cod", cod_data), ("elective", elective_data)):
+        df = pd.DataFrame(rows)
+        if label == "cod" and rows:
+            df = df.sort_values(by=["Stream", "Course Code"])
+        df.index = range(1, len(df) + 1)
+        frames[label] = df
+    return frames
+
+def semester_sort_key(sem_str):
+    if sem_str == VIRTUAL_SEMESTER:
+        return (9999, 3)
+    semester_order = {"SPRING": 0, "SUMMER": 1, "FALL": 2}
+    try:
+        sem, year = sem_str.split()
+        return (int(year), semester_order.get(sem.upper(), 99))
+    except:
+        return (9999, 99)
+
+@st.cache_data(max_entries=256)
+def semester_trends(fp, _semesters_done):
+    filtered_semesters = {sem: node for sem, node in _semesters_done.items() if sem.upper() != "NULL"}
+    semesters_list, gpas, cgpas, most_off_track = [], [], [], []
+
+    for sem in sorted(filtered_semesters.keys(), key=semester_sort_key):
+        node = filtered_semesters[sem]
+        if not node.courses:
+            continue
+        lowest_course = min(node.courses, key=lambda c: c.gpa)
+        semesters_list.append(sem)
+        gpas.append(node.gpa)
+        cgpas.append(node.cgpa)
+        most_off_track.append(f"{lowest_course.course} ({lowest_course.gpa:.2f})")
+
+    if not semesters_list:
+        return None
+    import pandas as pd
+    return pd.DataFrame({
+        "Semester": semesters_list,
+        "GPA": gpas,
+        "CGPA": cgpas,
+        "Most Off-Track Course": most_off_track
+    })